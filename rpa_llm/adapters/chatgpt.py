@@ -23,6 +23,25 @@ from .chatgpt_textbox import ChatGPTTextboxFinder
 from .chatgpt_send import ChatGPTSender
 from .chatgpt_wait import ChatGPTWaiter
 
+# _desired_variant 快速路径：常见写法（已 strip().lower()）精确查表，结果与下面的子串匹配逻辑一致；
+# 查不到再走原来的逻辑。只收录原逻辑在 model_version 和 CHATGPT_VARIANT 两个分支结果相同的写法，
+# 不做去标点等归一化（"5"、"p-ro"、"5 2 instant" 之类仍按原逻辑处理）
+_VARIANT_MAP = {
+    "5.2instant": "custom",
+    "5.2-instant": "custom",
+    "5-2-instant": "custom",
+    "gpt-5.2-instant": "custom",
+    "5.2pro": "pro",
+    "5.2-pro": "pro",
+    "5-2-pro": "pro",
+    "gpt-5.2-pro": "pro",
+    "instant": "instant",
+    "thinking": "thinking",
+    "pro": "pro",
+    "gpt-5": "pro",
+    "gpt5": "pro",
+}
+
 
 class ChatGPTAdapter(SiteAdapter):
     site_id = "chatgpt"
@@ -78,6 +97,18 @@ class ChatGPTAdapter(SiteAdapter):
         'nav button:first-child',
         'aside a[href="/"]',
     ]
+    # 新聊天 JS 直接点击用的选择器（_click_new_chat_button 一次 evaluate 依次尝试）
+    # 只能放原生 CSS 选择器（querySelectorAll 不认识 :has-text），文本匹配由策略 2 负责
+    NEW_CHAT_JS = (
+        'nav a[href="/"]',
+        'a[data-testid="create-new-chat-button"]',
+        'button[data-testid="create-new-chat-button"]',
+        'a[aria-label*="New chat"]',
+        'button[aria-label*="New chat"]',
+        'a[aria-label*="新聊天"]',
+        'button[aria-label*="新聊天"]',
+        'a[href="/"]',
+    )
 
     # 生成中按钮：用于判断是否还在生成
     STOP_BTN = [
@@ -115,6 +146,17 @@ class ChatGPTAdapter(SiteAdapter):
     # 短 prompt 应该使用：textarea -> fill(), contenteditable -> execCommand('insertText') 或 type()
     JS_INJECT_THRESHOLD = 2000
 
+    # 本类自己的实例属性走 slot（SiteAdapter 仍保留 __dict__，测试可以照常替换方法）
+    __slots__ = (
+        "_variant_set",
+        "_model_version",
+        "_textbox_finder",
+        "_state_detector",
+        "_model_selector",
+        "_sender",
+        "_waiter",
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._variant_set = False
@@ -196,6 +238,9 @@ class ChatGPTAdapter(SiteAdapter):
         # 优先使用实例变量（从 ask 方法传入），其次使用环境变量
         if self._model_version:
             v = self._model_version.strip().lower()
+            fast = _VARIANT_MAP.get(v)
+            if fast:
+                return fast
             # 关键修复：先检查完整的组合匹配，再检查部分匹配
             # 这样可以确保 "5.2instant" 不会被误判为 "pro"
             
@@ -223,9 +268,10 @@ class ChatGPTAdapter(SiteAdapter):
         # CHATGPT_VARIANT=instant|thinking|pro|5.2pro|5.2instant|gpt-5.2-pro
         v = (os.environ.get("CHATGPT_VARIANT") or "thinking").strip().lower()
         
-        # 先检查精确匹配
-        if v in ("instant", "thinking", "pro"):
-            return v
+        # 先检查精确匹配（含 5.2instant / 5.2pro / gpt-5 等常见写法）
+        fast = _VARIANT_MAP.get(v)
+        if fast:
+            return fast
         
         # 检查完整的组合
         if "5.2instant" in v or "5-2-instant" in v or "5.2-instant" in v:
@@ -799,35 +845,33 @@ class ChatGPTAdapter(SiteAdapter):
         """
         # 策略 1：使用 JS 直接点击（优先）
         # 这避免了 Playwright 的 actionability 等待和遮挡检测
-        js_selectors = [
-            'nav a[href="/"]',
-            'a[data-testid="create-new-chat-button"]',
-            'button[data-testid="create-new-chat-button"]',
-            'a[href="/"]',
-        ]
-        
-        for sel in js_selectors:
-            try:
-                clicked = await self.page.evaluate(
-                    """(selector) => {
-                        const el = document.querySelector(selector);
-                        if (el && el.offsetParent !== null) {
-                            // 确保元素可见
-                            el.scrollIntoView({behavior: 'instant', block: 'center'});
-                            // 触发点击
-                            el.click();
-                            return true;
-                        }
-                        return false;
-                    }""",
-                    sel
-                )
-                if clicked:
-                    self._log(f"new_chat: JS click succeeded on {sel}")
-                    return True
-            except Exception as e:
-                self._log(f"new_chat: JS click failed on {sel}: {e}")
-                continue
+        # 一次 evaluate 在页面内依次尝试所有选择器，避免每个选择器一次往返
+        try:
+            clicked_sel = await self.page.evaluate(
+                """(selectors) => {
+                    for (const selector of selectors) {
+                        try {
+                            // 同一选择器可能命中多个元素（如折叠的侧边栏里还有一份），取第一个可见的
+                            for (const el of document.querySelectorAll(selector)) {
+                                if (el.offsetParent !== null) {
+                                    // 确保元素可见
+                                    el.scrollIntoView({behavior: 'instant', block: 'center'});
+                                    // 触发点击
+                                    el.click();
+                                    return selector;
+                                }
+                            }
+                        } catch (e) {}
+                    }
+                    return null;
+                }""",
+                self.NEW_CHAT_JS
+            )
+            if clicked_sel:
+                self._log(f"new_chat: JS click succeeded on {clicked_sel}")
+                return True
+        except Exception as e:
+            self._log(f"new_chat: JS click failed: {e}")
         
         # 策略 2：使用文本匹配的 JS 点击
         try:
@@ -835,8 +879,9 @@ class ChatGPTAdapter(SiteAdapter):
                 """() => {
                     // 查找包含"新聊天"或"New chat"的链接或按钮
                     const texts = ['新聊天', 'New chat', 'New Chat'];
+                    // 只查询一次 DOM，三个文本共用同一份元素列表
+                    const elements = document.querySelectorAll('a, button');
                     for (const text of texts) {
-                        const elements = document.querySelectorAll('a, button');
                         for (const el of elements) {
                             if (el.textContent && el.textContent.includes(text)) {
                                 if (el.offsetParent !== null) {
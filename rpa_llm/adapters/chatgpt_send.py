@@ -53,6 +53,42 @@ class ChatGPTSender:
     # JS 注入阈值
     JS_INJECT_THRESHOLD = 2000
     
+    # 大 prompt：超过该长度发送前额外等待 ChatGPT 处理输入（每 50K 字符 0.5 秒，最多 2 秒）
+    LARGE_PROMPT_THRESHOLD = 50000
+    LARGE_PROMPT_MAX_WAIT_S = 2.0
+    
+    # 发送前准备：聚焦输入框（光标移到末尾）+ 检查发送按钮是否 disabled
+    _PREPARE_SEND_JS = """(args) => {
+        if (args.focus) {
+            const textarea = document.querySelector('#prompt-textarea');
+            if (textarea) {
+                textarea.focus();
+                // 将光标移到末尾
+                const range = document.createRange();
+                range.selectNodeContents(textarea);
+                range.collapse(false);
+                const sel = window.getSelection();
+                sel.removeAllRanges();
+                sel.addRange(range);
+            }
+        }
+        if (!args.check) return null;
+        
+        // 查找发送按钮
+        const sendBtn = document.querySelector('button[data-testid="send-button"]') ||
+                        document.querySelector('button[aria-label*="Send"]') ||
+                        document.querySelector('button[aria-label*="发送"]');
+        if (sendBtn) {
+            // 检查是否 disabled
+            if (sendBtn.disabled || sendBtn.getAttribute('aria-disabled') === 'true') {
+                return {ready: false, reason: 'button disabled'};
+            }
+            return {ready: true, reason: 'button found and enabled'};
+        }
+        // 如果找不到发送按钮，假设可以发送
+        return {ready: true, reason: 'no button found, assume ready'};
+    }"""
+    
     def __init__(
         self,
         page: Page,
@@ -99,66 +135,102 @@ class ChatGPTSender:
             except Exception:
                 pass
 
-    async def _wait_for_dom_stable(self, max_wait_s: float = 2.0) -> bool:
+    async def _wait_for_dom_stable(self, max_wait_s: float = 2.0, stable_ms: int = 300) -> bool:
         """
         P0-3 修复：等待 DOM 稳定，确保 textbox 可用。
         
         检查条件：
         1. #prompt-textarea 存在且可见
         2. 没有加载动画
-        3. 页面网络请求已稳定
+        3. 上述状态在 stable_ms 内没有变化
+        
+        在页面内用 MutationObserver 监听 DOM 变化，只在变化时重新计算状态，
+        一次 evaluate 等到结果，不再每 0.1s 轮询一次。
+        
+        标签页在后台（document.hidden）时浏览器会节流定时器，稳定计时不再可靠，
+        也不会有人把自动化窗口切回前台：此时只做一次同步检查就返回，不挂 observer。
         
         Args:
             max_wait_s: 最大等待时间（秒）
+            stable_ms: 状态保持不变多久才认为稳定（毫秒）
             
         Returns:
             True 如果 DOM 稳定，False 如果超时
         """
         t0 = time.time()
-        check_interval = 0.1
-        last_state = None
-        stable_count = 0
-        required_stable_count = 3  # 连续 3 次检查结果相同才认为稳定
         
-        while time.time() - t0 < max_wait_s:
+        while True:
+            remaining = max_wait_s - (time.time() - t0)
+            if remaining <= 0:
+                break
             try:
-                # 检查 textbox 状态
-                state = await self.page.evaluate(
-                    """() => {
-                        const textarea = document.querySelector('#prompt-textarea');
-                        if (!textarea) return {ready: false, reason: 'not found'};
-                        if (textarea.offsetParent === null) return {ready: false, reason: 'not visible'};
-                        
-                        // 检查是否有加载动画
-                        const spinners = document.querySelectorAll('[class*="loading"], [class*="spinner"], [class*="skeleton"]');
-                        for (const s of spinners) {
-                            if (s.offsetParent !== null) return {ready: false, reason: 'loading'};
-                        }
-                        
-                        return {ready: true, reason: 'ok'};
-                    }"""
+                state = await asyncio.wait_for(
+                    self.page.evaluate(
+                        """(args) => new Promise((resolve) => {
+                            const check = () => {
+                                const textarea = document.querySelector('#prompt-textarea');
+                                if (!textarea) return {ready: false, reason: 'not found'};
+                                if (textarea.offsetParent === null) return {ready: false, reason: 'not visible'};
+                                
+                                // 检查是否有加载动画
+                                const spinners = document.querySelectorAll('[class*="loading"], [class*="spinner"], [class*="skeleton"]');
+                                for (const s of spinners) {
+                                    if (s.offsetParent !== null) return {ready: false, reason: 'loading'};
+                                }
+                                
+                                return {ready: true, reason: 'ok'};
+                            };
+                            
+                            if (document.hidden) {
+                                resolve({...check(), hidden: true});
+                                return;
+                            }
+                            
+                            let last = check();
+                            let stableTimer = null;
+                            let deadline = null;
+                            let observer = null;
+                            const finish = (state) => {
+                                if (observer) observer.disconnect();
+                                clearTimeout(stableTimer);
+                                clearTimeout(deadline);
+                                resolve(state);
+                            };
+                            const arm = () => {
+                                clearTimeout(stableTimer);
+                                stableTimer = setTimeout(() => finish(last), args.stableMs);
+                            };
+                            
+                            // 只有状态真正变化才重新计时，无关的 DOM 变动不影响
+                            // 状态只有 ready/reason 两个字段，直接逐字段比较，每次变动不再序列化成 JSON
+                            observer = new MutationObserver(() => {
+                                const state = check();
+                                if (state.ready !== last.ready || state.reason !== last.reason) {
+                                    last = state;
+                                    arm();
+                                }
+                            });
+                            observer.observe(document.documentElement, {subtree: true, childList: true, attributes: true});
+                            deadline = setTimeout(() => finish({ready: false, reason: 'timeout'}), args.maxWaitMs);
+                            arm();
+                        })""",
+                        {"stableMs": stable_ms, "maxWaitMs": int(remaining * 1000)},
+                    ),
+                    timeout=remaining + 1.0,
                 )
-                
-                # 检查状态是否稳定
-                state_str = str(state)
-                if state_str == last_state:
-                    stable_count += 1
-                    if stable_count >= required_stable_count:
-                        if isinstance(state, dict) and state.get("ready"):
-                            self._log(f"send: DOM stable ({time.time() - t0:.2f}s)")
-                            return True
-                        else:
-                            # DOM 稳定但 textbox 不可用
-                            break
-                else:
-                    stable_count = 0
-                    last_state = state_str
-                    
             except Exception:
-                stable_count = 0
-                last_state = None
+                # 页面导航/重绘导致 evaluate 失败时，稍后在剩余时间内重试
+                await asyncio.sleep(0.1)
+                continue
             
-            await asyncio.sleep(check_interval)
+            if isinstance(state, dict) and state.get("hidden"):
+                self._log(f"send: tab hidden, skipped DOM stability wait (ready={bool(state.get('ready'))}, reason={state.get('reason')})")
+                return bool(state.get("ready"))
+            if isinstance(state, dict) and state.get("ready"):
+                self._log(f"send: DOM stable ({time.time() - t0:.2f}s)")
+                return True
+            # DOM 稳定但 textbox 不可用，或页面内已超时
+            break
         
         self._log(f"send: DOM stability timeout ({max_wait_s}s)")
         return False
@@ -260,6 +332,13 @@ class ChatGPTSender:
         
         return False
 
+    @classmethod
+    def _large_prompt_extra_wait(cls, prompt_len: int) -> float:
+        """发送前为大 prompt 额外等待的秒数；不超过阈值返回 0"""
+        if prompt_len <= cls.LARGE_PROMPT_THRESHOLD:
+            return 0.0
+        return min(cls.LARGE_PROMPT_MAX_WAIT_S, prompt_len / cls.LARGE_PROMPT_THRESHOLD * 0.5)
+
     async def _trigger_send_fast(self, user0: int, prompt_len: int = 0) -> None:
         """
         P0优化：快路径发送，使用 page.keyboard.press("Control+Enter") + 高频轮询确认。
@@ -271,57 +350,29 @@ class ChatGPTSender:
             user0: 发送前的用户消息数量
             prompt_len: prompt 长度（用于判断是否需要额外等待）
         """
-        # P0-2 修复：在发送前确保焦点在输入框，并等待 ChatGPT 处理大 prompt
+        # P0-2 修复：在发送前确保焦点在输入框，并检查发送按钮是否可用
+        # 普通 prompt：聚焦 + 按钮检查合并成一次 evaluate
+        # 大 prompt：先聚焦，等 ChatGPT 处理完输入后再单独检查按钮
+        extra_wait = self._large_prompt_extra_wait(prompt_len)
+        large_prompt = extra_wait > 0
+        state = None
         try:
-            # 使用 JS 确保焦点在输入框
-            await self.page.evaluate(
-                """() => {
-                    const textarea = document.querySelector('#prompt-textarea');
-                    if (textarea) {
-                        textarea.focus();
-                        // 将光标移到末尾
-                        const range = document.createRange();
-                        range.selectNodeContents(textarea);
-                        range.collapse(false);
-                        const sel = window.getSelection();
-                        sel.removeAllRanges();
-                        sel.addRange(range);
-                    }
-                }"""
-            )
+            state = await self.page.evaluate(self._PREPARE_SEND_JS, {"focus": True, "check": not large_prompt})
         except Exception:
             pass
         
         # P0-2 修复：对大 prompt（>50K 字符）增加等待时间，让 ChatGPT 处理输入
-        if prompt_len > 50000:
-            extra_wait = min(2.0, prompt_len / 50000 * 0.5)  # 最多等待 2 秒
+        if large_prompt:
             self._log(f"send: large prompt ({prompt_len} chars), waiting {extra_wait:.1f}s for ChatGPT to process...")
             await asyncio.sleep(extra_wait)
+            try:
+                state = await self.page.evaluate(self._PREPARE_SEND_JS, {"focus": False, "check": True})
+            except Exception:
+                state = None
         
-        # P0-2 修复：检查发送按钮是否可用（不是 disabled 状态）
-        try:
-            is_ready = await self.page.evaluate(
-                """() => {
-                    // 查找发送按钮
-                    const sendBtn = document.querySelector('button[data-testid="send-button"]') ||
-                                    document.querySelector('button[aria-label*="Send"]') ||
-                                    document.querySelector('button[aria-label*="发送"]');
-                    if (sendBtn) {
-                        // 检查是否 disabled
-                        if (sendBtn.disabled || sendBtn.getAttribute('aria-disabled') === 'true') {
-                            return {ready: false, reason: 'button disabled'};
-                        }
-                        return {ready: true, reason: 'button found and enabled'};
-                    }
-                    // 如果找不到发送按钮，假设可以发送
-                    return {ready: true, reason: 'no button found, assume ready'};
-                }"""
-            )
-            if isinstance(is_ready, dict) and not is_ready.get("ready"):
-                self._log(f"send: button not ready ({is_ready.get('reason')}), waiting 0.5s...")
-                await asyncio.sleep(0.5)
-        except Exception:
-            pass
+        if isinstance(state, dict) and not state.get("ready"):
+            self._log(f"send: button not ready ({state.get('reason')}), waiting 0.5s...")
+            await asyncio.sleep(0.5)
         
         # 使用 page.keyboard.press，避免 Locator.press() 的 actionability 等待
         self._log("send: pressing Control+Enter (fast path)...")
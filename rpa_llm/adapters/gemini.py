@@ -442,6 +442,22 @@ class GeminiAdapter(SiteAdapter):
             except Exception:
                 return ""
 
+    async def _tb_text_len(self, tb: Locator) -> int:
+        # 只取去掉首尾空白后的长度：在页面内 trim 并计数，不把 100K 级别的文本传回 Python 再 strip
+        # 按码点计数（[...s]），与 Python len() 一致；.length 是 UTF-16 单元，emoji 等会多算一倍
+        try:
+            return await tb.evaluate("(el) => [...(el.innerText || el.textContent || '').trim()].length")
+        except Exception:
+            try:
+                return len(((await tb.inner_text()) or "").strip())
+            except Exception:
+                return 0
+
+    @staticmethod
+    def _textbox_cleared(before_len: int, cur_len: int) -> bool:
+        # 输入框剩余内容不超过发送前的 10%，视为已发送（整数除法，等价于 int(before_len * 0.1)）
+        return before_len > 0 and cur_len <= before_len // 10
+
     async def _tb_clear(self, tb: Locator) -> None:
         # 修复：增强清空逻辑，确保完全清空，并验证清空结果
         # 方法1：用户式清空（Control+A + Backspace）
@@ -977,9 +993,8 @@ class GeminiAdapter(SiteAdapter):
             # 1. 最快：textbox cleared（最可靠的信号，优先检查）
             async def check_textbox_clear():
                 try:
-                    cur = (await self._tb_get_text(tb)).strip()
-                    cur_len = len(cur)
-                    if before_len > 0 and cur_len <= max(0, int(before_len * 0.1)):
+                    cur_len = await self._tb_text_len(tb)
+                    if self._textbox_cleared(before_len, cur_len):
                         return f"textbox_clear({before_len}->{cur_len})"
                 except Exception:
                     pass
@@ -1073,8 +1088,7 @@ class GeminiAdapter(SiteAdapter):
             
             # 快速检查：textbox 是否已清空（最可靠的信号）
             try:
-                current_text = (await self._tb_get_text(tb)).strip()
-                if before_len > 0 and len(current_text) <= max(0, int(before_len * 0.1)):
+                if self._textbox_cleared(before_len, await self._tb_text_len(tb)):
                     self._log("send: fast confirm - Control+Enter worked (textbox cleared)!")
                     return "control_enter:fast_confirm_textbox_cleared"
             except Exception:
@@ -1103,8 +1117,7 @@ class GeminiAdapter(SiteAdapter):
             await asyncio.sleep(0.5)  # 增加等待时间，让 Gemini 有时间响应
             
             # 检查输入框是否已清空
-            current_text = (await self._tb_get_text(tb)).strip()
-            if before_len > 0 and len(current_text) <= max(0, int(before_len * 0.1)):
+            if self._textbox_cleared(before_len, await self._tb_text_len(tb)):
                 self._log("send: Control+Enter already worked (textbox cleared after delay), skipping Enter")
                 return "control_enter:delayed_confirm_textbox_cleared"
             
@@ -1170,8 +1183,7 @@ class GeminiAdapter(SiteAdapter):
             # 显式捕获 TimeoutError，避免 Future exception
             try:
                 # 立即检查：textbox 是否已清空（即使 wait_for_function 超时，可能已经清空了）
-                current_text = (await self._tb_get_text(tb)).strip()
-                if before_len > 0 and len(current_text) <= max(0, int(before_len * 0.1)):
+                if self._textbox_cleared(before_len, await self._tb_text_len(tb)):
                     self._log("send: fast confirm - Enter key worked (detected after wait_for_function timeout)!")
                     return "enter:fast_confirm_after_timeout"
                 
@@ -1192,8 +1204,7 @@ class GeminiAdapter(SiteAdapter):
         # 因为 Enter 可能已经成功，但检测没有及时捕获到
         try:
             # 快速检查：textbox 是否已清空
-            current_text = (await self._tb_get_text(tb)).strip()
-            if before_len > 0 and len(current_text) <= max(0, int(before_len * 0.1)):
+            if self._textbox_cleared(before_len, await self._tb_text_len(tb)):
                 self._log("send: detected textbox cleared before button click, send already successful")
                 return "enter:detected_before_click"
             
@@ -1252,8 +1263,7 @@ class GeminiAdapter(SiteAdapter):
                         self._log("send: detected stop button during button check, send already successful (skipping to avoid stopping)")
                         return "enter:detected_stop_during_button_check"
                     
-                    current_text = (await self._tb_get_text(tb)).strip()
-                    if before_len > 0 and len(current_text) <= max(0, int(before_len * 0.1)):
+                    if self._textbox_cleared(before_len, await self._tb_text_len(tb)):
                         self._log("send: detected textbox cleared during button check, send already successful")
                         return "enter:detected_during_button_check"
                 except Exception:
@@ -1284,8 +1294,7 @@ class GeminiAdapter(SiteAdapter):
                         self._log("send: detected stop button just before click, send already successful (skipping click to avoid stopping)")
                         return "enter:detected_stop_just_before_click"
                     
-                    current_text = (await self._tb_get_text(tb)).strip()
-                    if before_len > 0 and len(current_text) <= max(0, int(before_len * 0.1)):
+                    if self._textbox_cleared(before_len, await self._tb_text_len(tb)):
                         self._log("send: detected textbox cleared just before click, send already successful")
                         return "enter:detected_just_before_click"
                 except Exception:
@@ -1315,8 +1324,7 @@ class GeminiAdapter(SiteAdapter):
                 self._log("send: detected stop button before JS click, send already successful (skipping JS click to avoid stopping)")
                 return "enter:detected_stop_before_js_click"
             
-            current_text = (await self._tb_get_text(tb)).strip()
-            if before_len > 0 and len(current_text) <= max(0, int(before_len * 0.1)):
+            if self._textbox_cleared(before_len, await self._tb_text_len(tb)):
                 self._log("send: detected textbox cleared before JS click, send already successful")
                 return "enter:detected_before_js_click"
             
@@ -1435,8 +1443,7 @@ class GeminiAdapter(SiteAdapter):
             async def _ready_check_text_set() -> bool:
                 # 检查文本是否已经设置成功
                 try:
-                    current_text = (await self._tb_get_text(tb)).strip()
-                    if len(current_text) >= len(prompt) * 0.8:  # 至少 80% 的内容
+                    if await self._tb_text_len(tb) >= len(prompt) * 0.8:  # 至少 80% 的内容
                         return True
                 except Exception:
                     pass
@@ -1450,9 +1457,9 @@ class GeminiAdapter(SiteAdapter):
             
             # 手动输入后，再次验证
             await asyncio.sleep(0.5)
-            current_text = (await self._tb_get_text(tb)).strip()
-            if len(current_text) < len(prompt) * 0.5:
-                raise RuntimeError(f"ask: text not set after manual checkpoint (expected ~{len(prompt)} chars, got {len(current_text)} chars)")
+            current_len = await self._tb_text_len(tb)
+            if current_len < len(prompt) * 0.5:
+                raise RuntimeError(f"ask: text not set after manual checkpoint (expected ~{len(prompt)} chars, got {current_len} chars)")
 
         before_text = (await self._tb_get_text(tb)).strip()
         before_len = len(before_text)
@@ -1497,8 +1504,7 @@ class GeminiAdapter(SiteAdapter):
             async def _ready_check_sent() -> bool:
                 # user manually sends: textbox shrinks, stop appears, or assistant changes
                 try:
-                    cur = (await self._tb_get_text(tb)).strip()
-                    if before_len > 0 and len(cur) <= max(0, int(before_len * 0.1)):
+                    if self._textbox_cleared(before_len, await self._tb_text_len(tb)):
                         return True
                 except Exception:
                     pass
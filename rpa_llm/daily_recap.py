@@ -28,6 +28,9 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("daily_recap")
 
+# 有 libyaml 时用 C 实现的 SafeLoader（Web 界面每个复盘请求都会新建 DailyRecapManager 并加载配置）
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass
 class ChatRecapTask:
@@ -88,7 +91,7 @@ class DailyRecapManager:
         """加载配置文件"""
         if self.config_path.exists():
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
+                return yaml.load(f, Loader=_YAML_LOADER) or {}
         return {}
     
     async def get_available_talkers(self, days: int = 7) -> List[Dict[str, Any]]:
@@ -7,9 +7,12 @@ Modified: 2025-12-31 19:09:41 +0800
 # rpa_llm/driver_client.py
 from __future__ import annotations
 
+import http.client
 import json
-import urllib.request
+import threading
 import urllib.error
+import urllib.parse
+import urllib.request
 from typing import Any, Dict, Optional
 
 
@@ -61,7 +64,46 @@ def run_task(driver_url: str, site_id: str, prompt: str, timeout_s: int = 1200,
         return {"ok": False, "error": str(e)}
 
 
-def health(driver_url: str) -> Dict[str, Any]:
-    url = driver_url.rstrip("/") + "/health"
-    with urllib.request.urlopen(url, timeout=5) as resp:
-        return json.loads(resp.read().decode("utf-8"))
\ No newline at end of file
+# /health 的长连接：每个线程按 (host, port) 各保留一个，轮询时不必每次重新建立 TCP 连接
+_health_local = threading.local()
+
+
+def health(driver_url: str, timeout: float = 5) -> Dict[str, Any]:
+    parts = urllib.parse.urlsplit(driver_url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    path = parts.path.rstrip("/") + "/health"
+    conns = getattr(_health_local, "conns", None)
+    if conns is None:
+        conns = _health_local.conns = {}
+
+    while True:
+        conn = conns.pop((host, port), None)
+        reused = conn is not None
+        if conn is None:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        else:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.HTTPException, ConnectionError):
+            conn.close()
+            if reused:
+                # 复用的连接可能已被 driver 关闭（空闲超时/重启），新建连接重试一次
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+        break
+
+    if resp.will_close:
+        conn.close()
+    else:
+        conns[(host, port)] = conn
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(driver_url.rstrip("/") + "/health", resp.status, resp.reason, resp.headers, None)
+    return json.loads(body.decode("utf-8"))
\ No newline at end of file
@@ -47,6 +47,9 @@ class DriverServer:
     每个 site_id 常驻一个 adapter（Playwright persistent context），并用 lock 保证站点内串行。
     """
 
+    # keep-alive 连接空闲多久（秒）没有新请求就关闭
+    KEEPALIVE_IDLE_S = 30.0
+
     def __init__(
         self,
         host: str,
@@ -158,17 +161,31 @@ class DriverServer:
             raise  # 重新抛出异常，让调用者知道失败
 
     async def _handle_conn(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # /health、/status 支持 HTTP/1.1 keep-alive：管理界面轮询时复用同一个连接；其他请求处理完即关闭
+        try:
+            while await self._handle_request(reader, writer):
+                pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """处理连接上的一个请求；返回 True 表示连接保持，可以继续读下一个请求"""
         # 添加请求追踪
         import uuid
         request_id = str(uuid.uuid4())[:8]
         recv_time = time.time()
         
         try:
-            req_line = await reader.readline()
+            try:
+                req_line = await asyncio.wait_for(reader.readline(), timeout=self.KEEPALIVE_IDLE_S)
+            except asyncio.TimeoutError:
+                return False
             if not req_line:
-                writer.close()
-                await writer.wait_closed()
-                return
+                return False
             req_line = req_line.decode("utf-8", errors="ignore").strip()
             parts = req_line.split()
             if len(parts) < 2:
@@ -193,14 +210,20 @@ class DriverServer:
                 if clen > 0:
                     body = await reader.readexactly(clen)
 
+            # HTTP/1.1 默认长连接，客户端显式要求 close 时才关闭（urllib 总是带 Connection: close）
+            keep_alive = (
+                len(parts) >= 3 and parts[2].upper() == "HTTP/1.1"
+                and headers.get("connection", "").lower() != "close"
+            )
+
             if method == "GET" and path == "/health":
-                await self._write_json(writer, 200, {"ok": True, "local": local_iso(), "utc": utc_iso()})
-                return
+                await self._write_json(writer, 200, {"ok": True, "local": local_iso(), "utc": utc_iso()}, keep_alive=keep_alive)
+                return keep_alive
 
             if method == "GET" and path == "/status":
                 status = {sid: {"ready": rt.ready} for sid, rt in self._sites.items()}
-                await self._write_json(writer, 200, {"ok": True, "sites": status, "local": local_iso(), "utc": utc_iso()})
-                return
+                await self._write_json(writer, 200, {"ok": True, "sites": status, "local": local_iso(), "utc": utc_iso()}, keep_alive=keep_alive)
+                return keep_alive
 
             if method == "POST" and path == "/run_task":
                 try:
@@ -378,20 +401,15 @@ class DriverServer:
                 await self._write_json(writer, 500, {"ok": False, "error": f"server error: {e}"})
             except Exception:
                 pass
-        finally:
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception:
-                pass
+        return False
 
-    async def _write_json(self, writer: asyncio.StreamWriter, status: int, obj: dict) -> None:
+    async def _write_json(self, writer: asyncio.StreamWriter, status: int, obj: dict, keep_alive: bool = False) -> None:
         data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
         status_line = f"HTTP/1.1 {status} OK\r\n"
         headers = (
             "Content-Type: application/json; charset=utf-8\r\n"
             f"Content-Length: {len(data)}\r\n"
-            "Connection: close\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
             "\r\n"
         )
         writer.write(status_line.encode("utf-8"))
@@ -0,0 +1,174 @@
+"""
+后台子进程管理（Web 管理界面用）
+
+按任务名（如 "driver"、"chatlog"、"warmup:gemini"）统一管理子进程：
+1. 同名任务同一时间只允许一个在运行，启动/停止在锁内完成
+2. 输出写入日志文件，进程放在独立进程组，停止时连同它拉起的浏览器一起结束
+3. 后台线程定期回收已退出的进程，记录退出码
+4. 每个进程缓存一个 psutil.Process，资源统计用 oneshot() 批量读取
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+
+class ProcessAlreadyRunning(RuntimeError):
+    """同名任务仍在运行"""
+
+
+@dataclass
+class ManagedProcess:
+    """一个受管子进程"""
+    name: str
+    proc: subprocess.Popen
+    log_file: Optional[Path]
+    started_at: float
+    returncode: Optional[int] = None
+    ended_at: Optional[float] = None
+    # 同一个 psutil.Process 反复使用：cpu_percent(None) 需要它记住上一次的采样
+    ps: Optional[psutil.Process] = None
+
+    @property
+    def pid(self) -> int:
+        return self.proc.pid
+
+    @property
+    def running(self) -> bool:
+        return self.returncode is None and self.proc.poll() is None
+
+
+class ProcessManager:
+    """进程内的子进程表：任务名 -> ManagedProcess"""
+
+    def __init__(self, cwd: Optional[Path] = None, reap_interval: float = 1.0):
+        self.cwd = cwd
+        self.reap_interval = reap_interval
+        self._procs: Dict[str, ManagedProcess] = {}
+        self._lock = threading.Lock()
+        self._reaper = threading.Thread(target=self._reap_loop, name="process-reaper", daemon=True)
+        self._reaper.start()
+
+    def spawn(self, name: str, cmd: List[str], log_file: Optional[Path] = None, **popen_kwargs) -> ManagedProcess:
+        """
+        启动任务；同名任务仍在运行时抛出 ProcessAlreadyRunning
+
+        stdout/stderr 写入 log_file（为空时丢弃）；其余参数原样传给 Popen
+        """
+        with self._lock:
+            current = self._procs.get(name)
+            if current is not None and current.running:
+                raise ProcessAlreadyRunning(f"{name} 正在运行 (PID: {current.pid})")
+
+            popen_kwargs.setdefault("cwd", self.cwd)
+            popen_kwargs.setdefault("start_new_session", True)
+            if log_file is not None:
+                log_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(log_file, 'w') as f:
+                    proc = subprocess.Popen(cmd, stdout=f, stderr=subprocess.STDOUT, **popen_kwargs)
+            else:
+                proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **popen_kwargs)
+
+            managed = ManagedProcess(name=name, proc=proc, log_file=log_file, started_at=time.time())
+            try:
+                managed.ps = psutil.Process(proc.pid)
+                managed.ps.cpu_percent(None)  # 第一次调用只建立基准，返回 0.0
+            except psutil.Error:
+                managed.ps = None
+            self._procs[name] = managed
+            return managed
+
+    def get(self, name: str) -> Optional[ManagedProcess]:
+        """最近一次启动的同名任务（可能已退出）；先同步一次退出状态"""
+        with self._lock:
+            managed = self._procs.get(name)
+            if managed is not None:
+                self._poll(managed)
+            return managed
+
+    def running(self, name: str) -> Optional[ManagedProcess]:
+        """正在运行的同名任务；没有则返回 None"""
+        managed = self.get(name)
+        return managed if managed is not None and managed.running else None
+
+    def stop(self, name: str, sig: int = signal.SIGTERM) -> Optional[int]:
+        """
+        向任务所在的整个进程组发信号
+
+        Returns:
+            停止的 pid；任务不存在或已退出时返回 None
+        """
+        with self._lock:
+            managed = self._procs.get(name)
+            if managed is None or not self._poll(managed):
+                return None
+            try:
+                if managed.proc.poll() is None:
+                    os.killpg(os.getpgid(managed.pid), sig)
+            except ProcessLookupError:
+                return None
+            return managed.pid
+
+    def stats(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        正在运行的任务的资源占用；任务不存在或已退出时返回 None
+
+        cpu 是距上一次调用以来的 CPU 占用率（%），rss 为常驻内存字节数
+        """
+        managed = self.running(name)
+        ps = managed.ps if managed is not None else None  # 回收线程可能同时把 managed.ps 置空
+        if ps is None:
+            return None
+        try:
+            with ps.oneshot():
+                return {
+                    "pid": managed.pid,
+                    "cpu": ps.cpu_percent(None),
+                    "rss": ps.memory_info().rss,
+                    "status": ps.status(),
+                    "uptime_s": round(time.time() - managed.started_at, 1),
+                }
+        except psutil.Error:
+            managed.ps = None
+            return None
+
+    def send_input(self, name: str, data: bytes) -> bool:
+        """向任务的 stdin 写入数据（需以 stdin=subprocess.PIPE 启动）；任务不在运行时返回 False"""
+        managed = self.running(name)
+        if managed is None or managed.proc.stdin is None:
+            return False
+        managed.proc.stdin.write(data)
+        managed.proc.stdin.flush()
+        return True
+
+    def _poll(self, managed: ManagedProcess) -> bool:
+        """同步退出状态（调用方持有锁）；返回是否仍在运行"""
+        if managed.returncode is not None:
+            return False
+        returncode = managed.proc.poll()
+        if returncode is None:
+            return True
+        managed.returncode = returncode
+        managed.ended_at = time.time()
+        managed.ps = None
+        if managed.proc.stdin is not None:
+            try:
+                managed.proc.stdin.close()
+            except OSError:
+                pass
+        return False
+
+    def _reap_loop(self) -> None:
+        # poll() 会回收已退出的子进程，避免长期无人查询的任务变成僵尸进程
+        while True:
+            with self._lock:
+                for managed in self._procs.values():
+                    self._poll(managed)
+            time.sleep(self.reap_interval)
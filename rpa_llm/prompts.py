@@ -8,7 +8,7 @@ Modified: 2025-12-31 19:09:49 +0800
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 import textwrap
 
 from .models import Brief, ModelResult
@@ -130,21 +130,23 @@ def _collect_site_material(
     """
     Collect OK outputs for a site, grouped by stream. Returns a Markdown string.
     """
-    ok_results = [
-        r for r in results
-        if r.ok and r.site_id == site_id and _safe(r.answer_text)
-    ]
-    if not ok_results:
+    # One pass: group stripped answers by stream (insertion order within a stream is preserved),
+    # instead of rescanning all results and re-stripping each answer once per stream.
+    by_stream: Dict[str, List[str]] = {}
+    for r in results:
+        if not (r.ok and r.site_id == site_id):
+            continue
+        text = _safe(r.answer_text)
+        if text:
+            by_stream.setdefault(r.stream_id, []).append(text)
+    if not by_stream:
         return f"（{site_id} 输出缺失或失败）"
 
-    stream_ids = sorted({r.stream_id for r in ok_results})[:max_streams]
+    stream_ids = sorted(by_stream)[:max_streams]
     parts: List[str] = []
 
     for sid in stream_ids:
-        seg = [r for r in ok_results if r.stream_id == sid]
-        combined = "\n\n".join([_safe(x.answer_text) for x in seg if _safe(x.answer_text)])
-        if not combined:
-            continue
+        combined = "\n\n".join(by_stream[sid])
 
         # Each stream as its own foldable block to keep prompt navigable
         block = _dedent(
@@ -11,7 +11,7 @@ Prompt 模板管理模块
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict, field
 
 
@@ -69,6 +69,11 @@ class TemplateManager:
         self.templates_file = self.data_dir / "templates.json"
         self.mappings_file = self.data_dir / "mappings.json"
         
+        # 合并后的模板内容缓存：template_id -> (content_version, 内容)
+        self._content_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        # 序列化后的模板列表缓存：llm_type -> (content_version, [模板 dict])
+        self._dicts_cache: Dict[Optional[str], Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+        
         # 初始化文件
         self._init_files()
     
@@ -80,6 +85,12 @@ class TemplateManager:
         if not self.mappings_file.exists():
             self._save_mappings([])
     
+    @property
+    def content_version(self) -> Tuple[int, int]:
+        """templates.json 的 (mtime_ns, size)；模板的增删改（包括直接编辑文件）都会改变它"""
+        st = self.templates_file.stat()
+        return (st.st_mtime_ns, st.st_size)
+    
     def _load_templates(self) -> List[PromptTemplate]:
         """加载所有模板"""
         with open(self.templates_file, 'r', encoding='utf-8') as f:
@@ -136,6 +147,20 @@ class TemplateManager:
             return [t for t in templates if t.llm_type in [llm_type, "all"]]
         return templates
     
+    def list_template_dicts(self, llm_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        list_templates 的 to_dict() 结果（接口返回用）
+        
+        按 content_version 和 llm_type 缓存，模板文件没变时直接返回同一个列表（调用方只读，不要修改）
+        """
+        version = self.content_version
+        cached = self._dicts_cache.get(llm_type)
+        if cached and cached[0] == version:
+            return cached[1]
+        dicts = [t.to_dict() for t in self.list_templates(llm_type=llm_type)]
+        self._dicts_cache[llm_type] = (version, dicts)
+        return dicts
+    
     def update_template(self, template_id: str, updates: Dict[str, Any]) -> PromptTemplate:
         """更新模板"""
         templates = self._load_templates()
@@ -184,22 +209,34 @@ class TemplateManager:
     def get_template_content(self, template_id: str) -> str:
         """
         获取模板的完整内容（如果是扩展模板，会合并基础模板）
+        
+        结果按 content_version 缓存，模板文件没变时不再重新读取和合并
         """
-        template = self.get_template(template_id)
-        if not template:
+        version = self.content_version
+        cached = self._content_cache.get(template_id)
+        if cached and cached[0] == version:
+            return cached[1]
+        
+        templates = {t.id: t for t in self._load_templates()}
+        if template_id not in templates:
             raise ValueError(f"模板不存在: {template_id}")
+        content = self._merge_content(templates, template_id)
+        self._content_cache[template_id] = (version, content)
+        return content
+    
+    def _merge_content(self, templates: Dict[str, PromptTemplate], template_id: str) -> str:
+        """沿 base_template_id 链合并内容：基础模板 + 扩展内容"""
+        template = templates[template_id]
         
         # 如果没有基础模板，直接返回
         if not template.base_template_id:
             return template.content
         
-        # 获取基础模板内容
-        base_template = self.get_template(template.base_template_id)
-        if not base_template:
+        if template.base_template_id not in templates:
             raise ValueError(f"基础模板不存在: {template.base_template_id}")
         
         # 递归获取基础模板内容
-        base_content = self.get_template_content(template.base_template_id)
+        base_content = self._merge_content(templates, template.base_template_id)
         
         # 合并：基础模板 + 扩展内容
         return f"{base_content}\n\n{template.content}"
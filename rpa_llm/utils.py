@@ -7,7 +7,10 @@ Modified: 2025-12-30 15:29:56 +0800
 from __future__ import annotations
 
 import asyncio
+import os
 import re
+import sys
+import threading
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Iterable, Optional
@@ -17,17 +20,25 @@ def utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
+# 北京时间（UTC+8），模块级常量，避免每条日志都重新构造 timezone 对象
+_BEIJING_TZ = timezone(timedelta(hours=8))
+
+
 def beijing_now_iso() -> str:
     """返回北京时间（UTC+8）的 ISO 格式字符串，用于日志输出"""
-    beijing_tz = timezone(timedelta(hours=8))
-    return datetime.now(beijing_tz).replace(microsecond=0).isoformat()
+    return datetime.now(_BEIJING_TZ).isoformat(timespec="seconds")
+
+
+# slugify 在每个任务/文件名上都会调用，正则在模块导入时编译一次
+_SLUG_WS_RE = re.compile(r"\s+")
+_SLUG_UNSAFE_RE = re.compile(r"[^\w\u4e00-\u9fff\-]+", re.UNICODE)
 
 
 def slugify(text: str, max_len: int = 60) -> str:
     # 简单可控的 slug：中文保留，空白转-，去掉不安全字符
     s = text.strip()
-    s = re.sub(r"\s+", "-", s)
-    s = re.sub(r"[^\w\u4e00-\u9fff\-]+", "", s, flags=re.UNICODE)
+    s = _SLUG_WS_RE.sub("-", s)
+    s = _SLUG_UNSAFE_RE.sub("", s)
     return s[:max_len] if len(s) > max_len else s
 
 
@@ -35,9 +46,61 @@ def ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
 
+def _read_stdin_line() -> str:
+    """
+    从 stdin 的文件描述符读一行（不含换行），EOF 时抛出 EOFError
+    
+    逐字节 os.read：不经过 sys.stdin 的缓冲区，也不持有它的锁——守护线程阻塞在这里时
+    解释器照常退出（持锁阻塞在 sys.stdin.readline 的守护线程会让退出时报 Fatal Python error）；
+    每次只读到换行为止，后续的输入留给下一次读取
+    """
+    fd = sys.stdin.fileno()
+    data = bytearray()
+    while True:
+        ch = os.read(fd, 1)
+        if not ch:
+            if not data:
+                raise EOFError("EOF when reading a line")
+            break
+        if ch == b"\n":
+            break
+        data += ch
+    return data.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r")
+
+
 async def ainput(prompt: str = "") -> str:
-    # 允许在 async 中等待用户输入（用于登录/验证码人工接管）
-    return await asyncio.to_thread(input, prompt)
+    """
+    允许在 async 中等待用户输入（用于登录/验证码人工接管）
+    
+    在守护线程里读取，结果通过 future 交回事件循环，等待可以被取消（Ctrl-C）。
+    不用 asyncio.to_thread(input)：默认线程池里阻塞的 input() 会让 asyncio.run 退出时一直等到用户按回车
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[str] = loop.create_future()
+
+    def deliver(result: Optional[str], error: Optional[BaseException]) -> None:
+        if future.done():  # 等待已被取消
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def read() -> None:
+        try:
+            result, error = _read_stdin_line(), None
+        except BaseException as e:  # EOFError 等交给等待方处理
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(deliver, result, error)
+        except RuntimeError:  # 事件循环已关闭
+            pass
+
+    if prompt:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+    threading.Thread(target=read, name="ainput", daemon=True).start()
+    return await future
 
 
 def first_nonempty(items: Iterable[Optional[str]]) -> Optional[str]:
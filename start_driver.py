@@ -93,9 +93,11 @@ async def main_async():
             self.files = files
         
         def write(self, obj):
+            # 按行刷新：print 分两次写入内容和换行，合并为每行一次系统调用，日志仍能实时查看
             for f in self.files:
                 f.write(obj)
-                f.flush()
+                if "\n" in obj:
+                    f.flush()
         
         def flush(self):
             for f in self.files:
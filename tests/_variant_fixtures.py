@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+ChatGPT 模型版本 -> 变体类型 的共享测试用例表
+
+test_chatgpt_model_version.py / _simple.py / _logic.py 共用，改匹配逻辑时只需要更新这一处
+"""
+from typing import Tuple
+
+VARIANT_CASES: Tuple[Tuple[str, str], ...] = (
+    ("5.2instant", "custom"),
+    ("5.2-instant", "custom"),
+    ("5-2-instant", "custom"),
+    ("gpt-5.2-instant", "custom"),
+    ("5.2pro", "pro"),
+    ("5.2-pro", "pro"),
+    ("5-2-pro", "pro"),
+    ("gpt-5.2-pro", "pro"),
+    ("instant", "instant"),
+    ("thinking", "thinking"),
+    ("pro", "pro"),
+    ("GPT-5", "pro"),
+    ("GPT-4o", "custom"),  # 未明确处理，返回 custom
+    # 不在快速路径表里的写法：仍按子串匹配，不能被当成近似拼写归一化
+    ("5", "custom"),
+    ("GPT 5", "custom"),
+    ("p-ro", "custom"),
+    ("in-stant", "custom"),
+    ("thin.king", "custom"),
+    ("5 2 instant", "instant"),
+)
+
+# CHATGPT_VARIANT 环境变量（model_version 未设置时）-> 变体类型
+ENV_VARIANT_CASES: Tuple[Tuple[str, str], ...] = (
+    ("5.2instant", "custom"),
+    ("gpt-5.2-instant", "custom"),
+    ("5.2pro", "pro"),
+    ("gpt-5.2-pro", "pro"),
+    ("instant", "instant"),
+    ("pro", "pro"),
+    ("gpt-5", "pro"),
+    # 其余写法一律回落到 thinking
+    ("gpt-instant", "thinking"),
+    ("5", "thinking"),
+    ("GPT 5", "thinking"),
+    ("p-ro", "thinking"),
+    ("5 2 instant", "thinking"),
+)
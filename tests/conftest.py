@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+pytest 公共配置：把项目根目录加入 sys.path（每个会话只执行一次），以及跨文件共用的 fixture
+"""
+import os
+import sys
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def base_brief():
+    """
+    CLI/orchestrator 测试共用的最小 Brief：整个会话只构造一次
+    
+    build_tasks 只读不写 brief；需要改字段的测试请用 dataclasses.replace 复制一份
+    """
+    from rpa_llm.models import Brief, StreamSpec
+    
+    return Brief(
+        topic="测试主题",
+        context="测试上下文",
+        questions=[],
+        streams=[
+            StreamSpec(
+                id="test",
+                name="Test",
+                prompt_template="默认模板：{topic}"
+            )
+        ],
+        sites=["chatgpt"],
+        output={}
+    )
+
+
+@pytest.fixture(scope="session")
+def chatgpt_adapter_cls():
+    """ChatGPTAdapter 类本身：只读类属性（选择器、阈值）的测试共用，整个会话只导入一次"""
+    from rpa_llm.adapters.chatgpt import ChatGPTAdapter
+    
+    return ChatGPTAdapter
+
+
+# mock_page 池：AsyncMock(spec=Page) 及其子 mock 的构造（每个约 1~2ms）比 reset_mock 贵几十倍，
+# 用完重置后放回池里给下一个测试复用
+_MOCK_PAGE_POOL: list = []
+_MOCK_PAGE_URL = "https://chatgpt.com/c/test-id"
+
+
+def _build_mock_page():
+    """构造一个 Playwright page 替身，覆盖各测试类用到的属性（url/keyboard/evaluate/locator/wait_for_function）"""
+    from playwright.async_api import Page
+    
+    page = AsyncMock(spec=Page)
+    page.keyboard = AsyncMock()
+    page.evaluate = AsyncMock()
+    page.locator = MagicMock()
+    page.wait_for_function = AsyncMock()
+    # 记住原始子 mock：测试里常会整体替换 page.evaluate，归还时要换回来
+    page._pool_children = {
+        name: getattr(page, name)
+        for name in ("keyboard", "evaluate", "locator", "wait_for_function")
+    }
+    return page
+
+
+def _release_mock_page(page) -> None:
+    """把 page 恢复成刚构造时的状态再放回池中"""
+    for name, child in page._pool_children.items():
+        child.reset_mock(return_value=True, side_effect=True)
+        setattr(page, name, child)
+    page.reset_mock(return_value=True, side_effect=True)
+    page.url = _MOCK_PAGE_URL
+    _MOCK_PAGE_POOL.append(page)
+
+
+@pytest.fixture
+def mock_page():
+    """从池中取一个 Playwright page 替身；测试结束后重置并归还"""
+    if _MOCK_PAGE_POOL:
+        page = _MOCK_PAGE_POOL.pop()
+    else:
+        page = _build_mock_page()
+        page.url = _MOCK_PAGE_URL
+    yield page
+    _release_mock_page(page)
@@ -5,9 +5,6 @@ Basic unit tests that don't require external dependencies
 import sys
 import os
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 
 def test_imports():
     """Test that all modules can be imported"""
@@ -66,21 +63,23 @@ def test_adapter_factory():
     from rpa_llm.adapters import create_adapter
     from pathlib import Path
     
+    test_dir = Path("test")
+    
     # Test creating adapters (check factory works)
     try:
-        adapter = create_adapter("chatgpt", profile_dir=Path("test"), artifacts_dir=Path("test"))
+        adapter = create_adapter("chatgpt", profile_dir=test_dir, artifacts_dir=test_dir)
         assert adapter.site_id == "chatgpt"
         
-        adapter = create_adapter("gemini", profile_dir=Path("test"), artifacts_dir=Path("test"))
+        adapter = create_adapter("gemini", profile_dir=test_dir, artifacts_dir=test_dir)
         assert adapter.site_id == "gemini"
         
-        adapter = create_adapter("grok", profile_dir=Path("test"), artifacts_dir=Path("test"))
+        adapter = create_adapter("grok", profile_dir=test_dir, artifacts_dir=test_dir)
         assert adapter.site_id == "grok"
         
-        adapter = create_adapter("perplexity", profile_dir=Path("test"), artifacts_dir=Path("test"))
+        adapter = create_adapter("perplexity", profile_dir=test_dir, artifacts_dir=test_dir)
         assert adapter.site_id == "perplexity"
         
-        adapter = create_adapter("qianwen", profile_dir=Path("test"), artifacts_dir=Path("test"))
+        adapter = create_adapter("qianwen", profile_dir=test_dir, artifacts_dir=test_dir)
         assert adapter.site_id == "qianwen"
         
         print("✓ Adapter factory test passed")
@@ -107,8 +106,10 @@ def test_invalid_adapter():
         return False
 
 
-def run_all_tests():
-    """Run all tests"""
+if __name__ == "__main__":
+    # Plain-script smoke run; under pytest, tests/conftest.py sets up the path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    
     print("=" * 50)
     print("Running Basic Unit Tests")
     print("=" * 50)
@@ -139,10 +140,4 @@ def run_all_tests():
     print(f"Tests: {passed} passed, {failed} failed")
     print("=" * 50)
     
-    return failed == 0
-
-
-if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
-
+    sys.exit(0 if failed == 0 else 1)
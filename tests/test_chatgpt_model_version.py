@@ -2,108 +2,111 @@
 """
 单元测试：验证 ChatGPT adapter 的模型版本选择逻辑
 """
-import os
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import Mock, AsyncMock
 from rpa_llm.adapters.chatgpt import ChatGPTAdapter
+from tests._variant_fixtures import ENV_VARIANT_CASES, VARIANT_CASES
+
+
+class FakeLocator:
+    """轻量 locator 替身：只实现 ensure_variant 用到的 count/is_visible/click
+
+    这些调用的参数测试里不检查，用普通 async def 即可；需要断言 call_args 的
+    （_select_model_menu_item、_set_thinking_toggle）才保留 AsyncMock
+    """
+
+    def __init__(self):
+        self.clicks = 0
+
+    async def count(self):
+        return 1
+
+    async def is_visible(self):
+        return True
+
+    async def click(self):
+        self.clicks += 1
+
+
+class FakePage:
+    """轻量 page 替身：记录 locator 调用，所有选择器都返回同一个 FakeLocator"""
+
+    def __init__(self):
+        self.locator_calls = []
+        self.first = FakeLocator()
+
+    def locator(self, selector, **kwargs):
+        self.locator_calls.append(selector)
+        return SimpleNamespace(first=self.first)
+
+
+def _make_adapter() -> ChatGPTAdapter:
+    return ChatGPTAdapter(
+        profile_dir=Mock(),
+        artifacts_dir=Mock(),
+        headless=True,
+        stealth=True
+    )
+
+
+@pytest.fixture(scope="class")
+def adapter():
+    """整个测试类共享一个 adapter：_desired_variant 只依赖 _model_version 和环境变量"""
+    return _make_adapter()
 
 
 class TestChatGPTModelVersion:
     """测试 ChatGPT 模型版本选择逻辑"""
     
-    def setup_method(self):
-        """每个测试方法前的设置"""
-        # 清除环境变量
-        if "CHATGPT_VARIANT" in os.environ:
-            del os.environ["CHATGPT_VARIANT"]
-    
-    def test_desired_variant_5_2_instant(self):
+    def test_desired_variant_5_2_instant(self, adapter):
         """测试 5.2instant 应该返回 custom"""
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
         adapter._model_version = "5.2instant"
         
         result = adapter._desired_variant()
         assert result == "custom", f"Expected 'custom', got '{result}'"
     
-    def test_desired_variant_5_2_pro(self):
+    def test_desired_variant_5_2_pro(self, adapter):
         """测试 5.2pro 应该返回 pro"""
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
         adapter._model_version = "5.2pro"
         
         result = adapter._desired_variant()
         assert result == "pro", f"Expected 'pro', got '{result}'"
     
-    def test_desired_variant_instant(self):
+    def test_desired_variant_instant(self, adapter):
         """测试 instant 应该返回 instant"""
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
         adapter._model_version = "instant"
         
         result = adapter._desired_variant()
         assert result == "instant", f"Expected 'instant', got '{result}'"
     
-    def test_desired_variant_thinking(self):
+    def test_desired_variant_thinking(self, adapter):
         """测试 thinking 应该返回 thinking"""
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
         adapter._model_version = "thinking"
         
         result = adapter._desired_variant()
         assert result == "thinking", f"Expected 'thinking', got '{result}'"
     
-    def test_desired_variant_pro(self):
+    def test_desired_variant_pro(self, adapter):
         """测试 pro 应该返回 pro"""
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
         adapter._model_version = "pro"
         
         result = adapter._desired_variant()
         assert result == "pro", f"Expected 'pro', got '{result}'"
     
-    def test_desired_variant_env_5_2_instant(self):
+    def test_desired_variant_env_5_2_instant(self, adapter, monkeypatch):
         """测试环境变量 CHATGPT_VARIANT=5.2instant"""
-        os.environ["CHATGPT_VARIANT"] = "5.2instant"
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
+        monkeypatch.setenv("CHATGPT_VARIANT", "5.2instant")
+        adapter._model_version = None
         
         result = adapter._desired_variant()
         assert result == "custom", f"Expected 'custom', got '{result}'"
     
-    def test_desired_variant_env_5_2_pro(self):
+    def test_desired_variant_env_5_2_pro(self, adapter, monkeypatch):
         """测试环境变量 CHATGPT_VARIANT=5.2pro"""
-        os.environ["CHATGPT_VARIANT"] = "5.2pro"
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
+        monkeypatch.setenv("CHATGPT_VARIANT", "5.2pro")
+        adapter._model_version = None
         
         result = adapter._desired_variant()
         assert result == "pro", f"Expected 'pro', got '{result}'"
@@ -111,24 +114,11 @@ class TestChatGPTModelVersion:
     @pytest.mark.asyncio
     async def test_ensure_variant_5_2_instant(self):
         """测试 ensure_variant 处理 5.2instant 时应该打开模型选择器"""
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
+        adapter = _make_adapter()
         
-        # Mock page 和 locator
-        mock_page = Mock()
-        mock_btn = Mock()
-        mock_locator = Mock()
-        
-        mock_page.locator.return_value.first = mock_locator
-        mock_locator.count = AsyncMock(return_value=1)
-        mock_locator.is_visible = AsyncMock(return_value=True)
-        mock_locator.click = AsyncMock()
-        
-        adapter.page = mock_page
+        # page 是只读属性，直接替换底层的 _page
+        fake_page = FakePage()
+        adapter._page = fake_page
         
         # Mock _select_model_menu_item
         adapter._select_model_menu_item = AsyncMock(return_value=True)
@@ -137,8 +127,8 @@ class TestChatGPTModelVersion:
         await adapter.ensure_variant(model_version="5.2instant")
         
         # 验证：应该打开模型选择器
-        assert mock_page.locator.called, "应该调用 page.locator 查找模型选择器按钮"
-        assert mock_locator.click.called, "应该点击模型选择器按钮"
+        assert fake_page.locator_calls, "应该调用 page.locator 查找模型选择器按钮"
+        assert fake_page.first.clicks, "应该点击模型选择器按钮"
         assert adapter._select_model_menu_item.called, "应该调用 _select_model_menu_item 选择模型"
         
         # 验证：传递的 pattern 应该匹配 Instant
@@ -161,24 +151,11 @@ class TestChatGPTModelVersion:
     @pytest.mark.asyncio
     async def test_ensure_variant_5_2_pro(self):
         """测试 ensure_variant 处理 5.2pro 时应该打开模型选择器"""
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
-        
-        # Mock page 和 locator
-        mock_page = Mock()
-        mock_btn = Mock()
-        mock_locator = Mock()
+        adapter = _make_adapter()
         
-        mock_page.locator.return_value.first = mock_locator
-        mock_locator.count = AsyncMock(return_value=1)
-        mock_locator.is_visible = AsyncMock(return_value=True)
-        mock_locator.click = AsyncMock()
-        
-        adapter.page = mock_page
+        # page 是只读属性，直接替换底层的 _page
+        fake_page = FakePage()
+        adapter._page = fake_page
         
         # Mock _select_model_menu_item
         adapter._select_model_menu_item = AsyncMock(return_value=True)
@@ -187,8 +164,8 @@ class TestChatGPTModelVersion:
         await adapter.ensure_variant(model_version="5.2pro")
         
         # 验证：应该打开模型选择器
-        assert mock_page.locator.called, "应该调用 page.locator 查找模型选择器按钮"
-        assert mock_locator.click.called, "应该点击模型选择器按钮"
+        assert fake_page.locator_calls, "应该调用 page.locator 查找模型选择器按钮"
+        assert fake_page.first.clicks, "应该点击模型选择器按钮"
         assert adapter._select_model_menu_item.called, "应该调用 _select_model_menu_item 选择模型"
         
         # 验证：传递的 pattern 应该匹配 Pro
@@ -211,16 +188,10 @@ class TestChatGPTModelVersion:
     @pytest.mark.asyncio
     async def test_ensure_variant_instant_only(self):
         """测试 ensure_variant 处理单独的 instant 时应该只设置 toggle，不打开模型选择器"""
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
+        adapter = _make_adapter()
         
-        # Mock page
-        mock_page = Mock()
-        adapter.page = mock_page
+        fake_page = FakePage()
+        adapter._page = fake_page
         
         # Mock _set_thinking_toggle
         adapter._set_thinking_toggle = AsyncMock()
@@ -231,21 +202,15 @@ class TestChatGPTModelVersion:
         # 验证：应该只设置 thinking toggle，不打开模型选择器
         assert adapter._set_thinking_toggle.called, "应该调用 _set_thinking_toggle"
         assert adapter._set_thinking_toggle.call_args[0][0] == False, "应该设置 want_thinking=False"
-        assert not mock_page.locator.called, "不应该打开模型选择器"
+        assert not fake_page.locator_calls, "不应该打开模型选择器"
     
     @pytest.mark.asyncio
     async def test_ensure_variant_thinking_only(self):
         """测试 ensure_variant 处理 thinking 时应该只设置 toggle，不打开模型选择器"""
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
+        adapter = _make_adapter()
         
-        # Mock page
-        mock_page = Mock()
-        adapter.page = mock_page
+        fake_page = FakePage()
+        adapter._page = fake_page
         
         # Mock _set_thinking_toggle
         adapter._set_thinking_toggle = AsyncMock()
@@ -256,38 +221,22 @@ class TestChatGPTModelVersion:
         # 验证：应该只设置 thinking toggle，不打开模型选择器
         assert adapter._set_thinking_toggle.called, "应该调用 _set_thinking_toggle"
         assert adapter._set_thinking_toggle.call_args[0][0] == True, "应该设置 want_thinking=True"
-        assert not mock_page.locator.called, "不应该打开模型选择器"
+        assert not fake_page.locator_calls, "不应该打开模型选择器"
     
-    def test_desired_variant_variations(self):
+    @pytest.mark.parametrize("model_version,expected", VARIANT_CASES)
+    def test_desired_variant_variations(self, adapter, model_version, expected):
         """测试各种变体格式"""
-        adapter = ChatGPTAdapter(
-            profile_dir=Mock(),
-            artifacts_dir=Mock(),
-            headless=True,
-            stealth=True
-        )
-        
-        test_cases = [
-            ("5.2instant", "custom"),
-            ("5.2-instant", "custom"),
-            ("5-2-instant", "custom"),
-            ("gpt-5.2-instant", "custom"),
-            ("5.2pro", "pro"),
-            ("5.2-pro", "pro"),
-            ("5-2-pro", "pro"),
-            ("gpt-5.2-pro", "pro"),
-            ("instant", "instant"),
-            ("thinking", "thinking"),
-            ("pro", "pro"),
-            ("GPT-5", "pro"),
-            ("GPT-4o", "custom"),  # 未明确处理，返回 custom
-        ]
-        
-        for model_version, expected in test_cases:
-            adapter._model_version = model_version
-            result = adapter._desired_variant()
-            assert result == expected, f"model_version='{model_version}' 应该返回 '{expected}', 但返回了 '{result}'"
+        adapter._model_version = model_version
+        result = adapter._desired_variant()
+        assert result == expected, f"model_version='{model_version}' 应该返回 '{expected}', 但返回了 '{result}'"
 
+    @pytest.mark.parametrize("env_value,expected", ENV_VARIANT_CASES)
+    def test_desired_variant_env_variations(self, adapter, monkeypatch, env_value, expected):
+        """测试 CHATGPT_VARIANT 的各种写法"""
+        monkeypatch.setenv("CHATGPT_VARIANT", env_value)
+        adapter._model_version = None
+        result = adapter._desired_variant()
+        assert result == expected, f"CHATGPT_VARIANT='{env_value}' 应该返回 '{expected}', 但返回了 '{result}'"
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -7,6 +7,11 @@ import os
 import sys
 import re
 
+try:
+    from tests._variant_fixtures import VARIANT_CASES
+except ImportError:  # 直接以脚本运行时 tests/ 本身就在 sys.path[0]
+    from _variant_fixtures import VARIANT_CASES
+
 
 def desired_variant_logic(model_version=None, env_variant=None):
     """
@@ -71,26 +76,11 @@ def test_desired_variant():
     print("测试 _desired_variant 逻辑")
     print("=" * 60)
     
-    test_cases = [
-        # (model_version, expected_variant, description)
-        ("5.2instant", "custom", "5.2instant 应该返回 custom（需要打开模型选择器）"),
-        ("5.2-instant", "custom", "5.2-instant 应该返回 custom"),
-        ("5-2-instant", "custom", "5-2-instant 应该返回 custom"),
-        ("gpt-5.2-instant", "custom", "gpt-5.2-instant 应该返回 custom"),
-        ("5.2pro", "pro", "5.2pro 应该返回 pro"),
-        ("5.2-pro", "pro", "5.2-pro 应该返回 pro"),
-        ("5-2-pro", "pro", "5-2-pro 应该返回 pro"),
-        ("gpt-5.2-pro", "pro", "gpt-5.2-pro 应该返回 pro"),
-        ("instant", "instant", "instant 应该返回 instant（只需要设置 toggle）"),
-        ("thinking", "thinking", "thinking 应该返回 thinking"),
-        ("pro", "pro", "pro 应该返回 pro"),
-        ("GPT-5", "pro", "GPT-5 应该返回 pro"),
-    ]
-    
     passed = 0
     failed = 0
     
-    for model_version, expected, description in test_cases:
+    for model_version, expected in VARIANT_CASES:
+        description = f"{model_version} 应该返回 {expected}"
         result = desired_variant_logic(model_version=model_version)
         
         if result == expected:
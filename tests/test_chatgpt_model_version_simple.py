@@ -1,22 +1,30 @@
 # -*- coding: utf-8 -*-
 """
 简单测试脚本：验证 ChatGPT adapter 的模型版本选择逻辑
-不依赖 pytest，可以直接运行
+不依赖 pytest，可以直接运行（在 pytest 下会整体跳过）
 """
 import os
+import re
 import sys
 from pathlib import Path
 
-# 添加项目根目录到路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+if "pytest" in sys.modules:
+    # pytest 下由 test_chatgpt_model_version.py 覆盖同样的用例；本文件只作为无 pytest 环境的兜底脚本
+    import pytest
+    pytest.skip("covered by test_chatgpt_model_version.py", allow_module_level=True)
 
-from unittest.mock import Mock
-from rpa_llm.adapters.chatgpt import ChatGPTAdapter
+try:
+    from tests._variant_fixtures import VARIANT_CASES
+except ImportError:  # 直接以脚本运行时 tests/ 本身就在 sys.path[0]
+    from _variant_fixtures import VARIANT_CASES
 
 
 def test_desired_variant():
     """测试 _desired_variant 方法"""
+    # 延迟导入：只有用到 adapter 的测试才加载 playwright 及整个 adapter 栈
+    from unittest.mock import Mock
+    from rpa_llm.adapters.chatgpt import ChatGPTAdapter
+
     print("=" * 60)
     print("测试 _desired_variant 方法")
     print("=" * 60)
@@ -32,25 +40,11 @@ def test_desired_variant():
         stealth=True
     )
     
-    test_cases = [
-        # (model_version, expected_variant, description)
-        ("5.2instant", "custom", "5.2instant 应该返回 custom（需要打开模型选择器）"),
-        ("5.2-instant", "custom", "5.2-instant 应该返回 custom"),
-        ("5-2-instant", "custom", "5-2-instant 应该返回 custom"),
-        ("5.2pro", "pro", "5.2pro 应该返回 pro"),
-        ("5.2-pro", "pro", "5.2-pro 应该返回 pro"),
-        ("5-2-pro", "pro", "5-2-pro 应该返回 pro"),
-        ("gpt-5.2-pro", "pro", "gpt-5.2-pro 应该返回 pro"),
-        ("instant", "instant", "instant 应该返回 instant（只需要设置 toggle）"),
-        ("thinking", "thinking", "thinking 应该返回 thinking"),
-        ("pro", "pro", "pro 应该返回 pro"),
-        ("GPT-5", "pro", "GPT-5 应该返回 pro"),
-    ]
-    
     passed = 0
     failed = 0
     
-    for model_version, expected, description in test_cases:
+    for model_version, expected in VARIANT_CASES:
+        description = f"{model_version} 应该返回 {expected}"
         adapter._model_version = model_version
         result = adapter._desired_variant()
         
@@ -70,6 +64,9 @@ def test_desired_variant():
 
 def test_desired_variant_env():
     """测试环境变量"""
+    from unittest.mock import Mock
+    from rpa_llm.adapters.chatgpt import ChatGPTAdapter
+
     print("=" * 60)
     print("测试环境变量 CHATGPT_VARIANT")
     print("=" * 60)
@@ -113,8 +110,6 @@ def test_pattern_matching():
     print("测试正则表达式匹配模式")
     print("=" * 60)
     
-    import re
-    
     # 测试 5.2instant 的匹配模式
     pattern_instant = re.compile(r"5[.\-]?2.*instant|instant.*5[.\-]?2|5[.\-]?2.*即时|即时.*5[.\-]?2", re.I)
     
@@ -186,5 +181,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # 直接运行时添加项目根目录到路径（pytest 下由 tests/conftest.py 负责）
+    sys.path.insert(0, str(Path(__file__).parent.parent))
     sys.exit(main())
 
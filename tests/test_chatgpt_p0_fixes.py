@@ -15,182 +15,142 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+@pytest.fixture
+def sender(mock_page):
+    """ChatGPTSender wired to the test class's mock_page; other dependencies are unused stubs"""
+    from rpa_llm.adapters.chatgpt_send import ChatGPTSender
+    
+    deps = {name: MagicMock() for name in (
+        "find_textbox_fn", "user_count_fn", "dismiss_overlays_fn", "ready_check_textbox_fn",
+        "manual_checkpoint_fn", "save_artifacts_fn", "clean_newlines_fn",
+        "tb_clear_fn", "tb_set_text_fn", "tb_get_text_fn", "tb_kind_fn",
+    )}
+    return ChatGPTSender(page=mock_page, logger=lambda msg: None, **deps)
+
+
 class TestNewChatButtonClick:
     """P0-1: Tests for _click_new_chat_button improvements"""
     
     @pytest.fixture
-    def mock_page(self):
-        """Create a mock Playwright page"""
-        page = AsyncMock()
-        page.url = "https://chatgpt.com/c/test-id"
-        page.evaluate = AsyncMock()
-        page.locator = MagicMock()
-        return page
+    def adapter(self, chatgpt_adapter_cls, mock_page):
+        from pathlib import Path
+        
+        adapter = chatgpt_adapter_cls(profile_dir=Path("test"), artifacts_dir=Path("test"))
+        adapter._page = mock_page
+        return adapter
     
     @pytest.mark.asyncio
-    async def test_js_click_succeeds_first_selector(self, mock_page):
-        """Test that JS click works on first selector"""
-        mock_page.evaluate = AsyncMock(return_value=True)
+    async def test_js_click_succeeds_first_selector(self, adapter, mock_page):
+        """Test that all JS selectors are tried in a single evaluate round trip"""
+        mock_page.evaluate = AsyncMock(return_value='nav a[href="/"]')
         
-        # Simulate the JS click logic
-        js_selectors = [
-            'nav a[href="/"]',
-            'a[data-testid="create-new-chat-button"]',
-        ]
-        
-        clicked = False
-        for sel in js_selectors:
-            result = await mock_page.evaluate(
-                """(selector) => {
-                    const el = document.querySelector(selector);
-                    if (el && el.offsetParent !== null) {
-                        el.click();
-                        return true;
-                    }
-                    return false;
-                }""",
-                sel
-            )
-            if result:
-                clicked = True
-                break
+        clicked = await adapter._click_new_chat_button()
         
         assert clicked is True
         assert mock_page.evaluate.call_count == 1
+        # The whole selector list is passed to the page in one call
+        selectors = mock_page.evaluate.call_args[0][1]
+        assert len(selectors) > 1
     
     @pytest.mark.asyncio
-    async def test_js_click_fallback_to_text_based(self, mock_page):
+    async def test_js_click_fallback_to_text_based(self, adapter, mock_page):
         """Test that JS click falls back to text-based click when selectors fail"""
-        # First 2 calls return False (JS selectors not found)
-        # Third call (text-based) returns True
-        mock_page.evaluate = AsyncMock(side_effect=[False, False, True])
-        
-        js_selectors = ['nav a[href="/"]', 'a[data-testid="create-new-chat-button"]']
+        # First call: no selector matched; second call (text-based) succeeds
+        mock_page.evaluate = AsyncMock(side_effect=[None, True])
         
-        clicked = False
-        for sel in js_selectors:
-            result = await mock_page.evaluate("...", sel)
-            if result:
-                clicked = True
-                break
-        
-        if not clicked:
-            # Try text-based click
-            result = await mock_page.evaluate("...")
-            if result:
-                clicked = True
+        clicked = await adapter._click_new_chat_button()
         
         assert clicked is True
-        assert mock_page.evaluate.call_count == 3
+        assert mock_page.evaluate.call_count == 2
 
 
 class TestControlEnterSendOptimization:
     """P0-2: Tests for Control+Enter send optimization"""
     
-    @pytest.fixture
-    def mock_page(self):
-        """Create a mock Playwright page"""
-        page = AsyncMock()
-        page.keyboard = AsyncMock()
-        page.evaluate = AsyncMock()
-        return page
-    
-    @pytest.mark.asyncio
-    async def test_large_prompt_extra_wait(self, mock_page):
-        """Test that large prompts get extra wait time"""
-        prompt_len = 100000  # 100K characters
-        
-        # Calculate expected wait time
-        if prompt_len > 50000:
-            extra_wait = min(2.0, prompt_len / 50000 * 0.5)
-        else:
-            extra_wait = 0
-        
-        assert extra_wait > 0
-        assert extra_wait <= 2.0
-        # 100K / 50K * 0.5 = 1.0s
-        assert abs(extra_wait - 1.0) < 0.01
-    
-    @pytest.mark.asyncio
-    async def test_small_prompt_no_extra_wait(self, mock_page):
-        """Test that small prompts don't get extra wait time"""
-        prompt_len = 10000  # 10K characters
+    @pytest.mark.parametrize("prompt_len, expected_wait", [
+        (1000, 0.0),        # 1K: no extra wait
+        (10000, 0.0),       # 10K: no extra wait
+        (50000, 0.0),       # exactly at the threshold: still no extra wait
+        (60000, 0.6),
+        (100000, 1.0),      # 100K / 50K * 0.5 = 1.0s
+        (1000000, 2.0),     # capped at 2s
+    ])
+    def test_large_prompt_extra_wait(self, prompt_len, expected_wait):
+        """Test that only prompts above 50K get extra wait time, capped at 2s"""
+        from rpa_llm.adapters.chatgpt_send import ChatGPTSender
         
-        if prompt_len > 50000:
-            extra_wait = min(2.0, prompt_len / 50000 * 0.5)
-        else:
-            extra_wait = 0
+        extra_wait = ChatGPTSender._large_prompt_extra_wait(prompt_len)
         
-        assert extra_wait == 0
+        assert abs(extra_wait - expected_wait) < 0.01
     
     @pytest.mark.asyncio
-    async def test_focus_before_send(self, mock_page):
-        """Test that textbox is focused before sending"""
-        mock_page.evaluate = AsyncMock(return_value=None)
-        
-        # Simulate focus logic
-        focus_script = """() => {
-            const textarea = document.querySelector('#prompt-textarea');
-            if (textarea) {
-                textarea.focus();
-            }
-        }"""
+    async def test_focus_before_send(self, sender, mock_page):
+        """Test that focus and the send-button check share one evaluate round trip"""
+        mock_page.evaluate = AsyncMock(side_effect=[
+            {'ready': True, 'reason': 'button found and enabled'},
+            {'signal': 'user_count', 'value': 1},
+        ])
         
-        await mock_page.evaluate(focus_script)
+        await sender._trigger_send_fast(user0=0, prompt_len=1000)
         
-        mock_page.evaluate.assert_called_once()
+        # 1 x focus+check, 1 x send confirmation
+        assert mock_page.evaluate.call_count == 2
+        prepare_args = mock_page.evaluate.call_args_list[0][0][1]
+        assert prepare_args == {"focus": True, "check": True}
+        mock_page.keyboard.press.assert_called_once_with("Control+Enter")
     
     @pytest.mark.asyncio
-    async def test_button_disabled_check(self, mock_page):
-        """Test that disabled button is detected"""
-        mock_page.evaluate = AsyncMock(return_value={
-            'ready': False,
-            'reason': 'button disabled'
-        })
-        
-        result = await mock_page.evaluate("...")
-        
-        assert result['ready'] is False
-        assert result['reason'] == 'button disabled'
+    async def test_button_disabled_check(self, sender, mock_page):
+        """Test that disabled button is detected before sending"""
+        mock_page.evaluate = AsyncMock(side_effect=[
+            {'ready': False, 'reason': 'button disabled'},
+            {'signal': 'user_count', 'value': 1},
+        ])
+        logs = []
+        sender._log = logs.append
+        
+        await sender._trigger_send_fast(user0=0, prompt_len=1000)
+        
+        assert any('button disabled' in msg for msg in logs)
+        assert mock_page.evaluate.call_count == 2
 
 
 class TestDOMStabilityWait:
     """P0-3: Tests for DOM stability wait"""
     
-    @pytest.fixture
-    def mock_page(self):
-        """Create a mock Playwright page"""
-        page = AsyncMock()
-        page.evaluate = AsyncMock()
-        return page
+    @pytest.mark.asyncio
+    async def test_dom_stable_immediately(self, sender, mock_page):
+        """Test that a stable DOM is detected with a single evaluate round trip"""
+        # A one-element sequence: any second evaluate would raise StopAsyncIteration
+        mock_page.evaluate = AsyncMock(side_effect=[{'ready': True, 'reason': 'ok'}])
+        
+        assert await sender._wait_for_dom_stable(max_wait_s=2.0) is True
+        # The MutationObserver wait runs inside the page: no Python-side polling
+        assert mock_page.evaluate.await_count == 1
+        args = mock_page.evaluate.call_args[0][1]
+        assert args["stableMs"] == 300
+        assert 0 < args["maxWaitMs"] <= 2000
     
     @pytest.mark.asyncio
-    async def test_dom_stable_immediately(self, mock_page):
-        """Test that DOM is detected as stable immediately"""
-        mock_page.evaluate = AsyncMock(return_value={
-            'ready': True,
-            'reason': 'ok'
-        })
-        
-        # Simulate stability check
-        stable_count = 0
-        required_stable_count = 3
-        last_state = None
-        
-        for _ in range(5):
-            state = await mock_page.evaluate("...")
-            state_str = str(state)
-            
-            if state_str == last_state:
-                stable_count += 1
-                if stable_count >= required_stable_count:
-                    break
-            else:
-                stable_count = 0
-                last_state = state_str
+    async def test_dom_stable_but_not_ready(self, sender, mock_page):
+        """Test that a settled but unusable textbox returns False without retrying"""
+        mock_page.evaluate = AsyncMock(side_effect=[{'ready': False, 'reason': 'not visible'}])
         
-        # Should need 4 calls to reach stable_count >= 3
-        assert mock_page.evaluate.call_count >= 4
+        assert await sender._wait_for_dom_stable(max_wait_s=2.0) is False
+        assert mock_page.evaluate.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_dom_wait_respects_hidden_tab(self, sender, mock_page):
+        """Test that a hidden tab returns the current state without waiting or retrying"""
+        mock_page.evaluate = AsyncMock(side_effect=[{'ready': True, 'reason': 'ok', 'hidden': True}])
+        logs = []
+        sender._log = logs.append
+        
+        assert await sender._wait_for_dom_stable(max_wait_s=2.0) is True
+        assert mock_page.evaluate.await_count == 1
+        assert any('tab hidden' in msg for msg in logs)
+        # The hidden check lives in the same script: no separate document.hidden round trip
+        assert 'document.hidden' in mock_page.evaluate.call_args[0][0]
     
     @pytest.mark.asyncio
     async def test_dom_not_ready_loading(self, mock_page):
@@ -219,26 +179,35 @@ class TestDOMStabilityWait:
         assert result['reason'] == 'not found'
 
 
+@pytest.fixture(scope="class")
+def joined_selectors(chatgpt_adapter_cls):
+    """NEW_CHAT joined once per class; each check is then one substring search"""
+    return "\n".join(chatgpt_adapter_cls.NEW_CHAT)
+
+
 class TestNewChatSelectors:
     """Test that NEW_CHAT selectors are properly defined"""
     
-    def test_new_chat_selectors_exist(self):
+    def test_new_chat_selectors_exist(self, joined_selectors):
         """Test that NEW_CHAT selectors include the expected patterns"""
-        from rpa_llm.adapters.chatgpt import ChatGPTAdapter
-        
-        selectors = ChatGPTAdapter.NEW_CHAT
-        
         # Check for key selectors
-        assert any('href="/"' in s for s in selectors), "Should have href='/' selector"
-        assert any('data-testid' in s for s in selectors), "Should have data-testid selector"
-        assert any('新聊天' in s for s in selectors), "Should have Chinese text selector"
-        assert any('New chat' in s for s in selectors), "Should have English text selector"
+        assert 'href="/"' in joined_selectors, "Should have href='/' selector"
+        assert 'data-testid' in joined_selectors, "Should have data-testid selector"
+        assert '新聊天' in joined_selectors, "Should have Chinese text selector"
+        assert 'New chat' in joined_selectors, "Should have English text selector"
     
-    def test_new_chat_selectors_count(self):
-        """Test that there are enough backup selectors"""
-        from rpa_llm.adapters.chatgpt import ChatGPTAdapter
+    def test_new_chat_js_selectors(self, chatgpt_adapter_cls):
+        """Test that the JS click selectors are a precomputed tuple"""
+        selectors = chatgpt_adapter_cls.NEW_CHAT_JS
         
-        selectors = ChatGPTAdapter.NEW_CHAT
+        assert isinstance(selectors, tuple)
+        assert 'nav a[href="/"]' in selectors
+        # querySelectorAll in the page only understands plain CSS
+        assert not any(":has-text" in sel or sel.startswith("text=") for sel in selectors)
+    
+    def test_new_chat_selectors_count(self, chatgpt_adapter_cls):
+        """Test that there are enough backup selectors"""
+        selectors = chatgpt_adapter_cls.NEW_CHAT
         
         # Should have at least 10 backup selectors
         assert len(selectors) >= 10, f"Expected at least 10 selectors, got {len(selectors)}"
@@ -256,19 +225,17 @@ class TestPromptLengthThresholds:
         # Should be 2000 characters
         assert threshold == 2000
     
-    def test_large_prompt_threshold(self):
-        """Test that large prompt threshold is reasonable"""
-        # Large prompt threshold is 50000 characters
-        threshold = 50000
-        
-        # Typical prompt sizes
-        small_prompt = 1000  # 1K
-        medium_prompt = 10000  # 10K
-        large_prompt = 100000  # 100K
+    @pytest.mark.parametrize("prompt_len, is_large", [
+        (1000, False),      # 1K
+        (10000, False),     # 10K
+        (100000, True),     # 100K
+    ])
+    def test_large_prompt_threshold(self, prompt_len, is_large):
+        """Test that large prompt threshold (50000 characters) is reasonable"""
+        from rpa_llm.adapters.chatgpt_send import ChatGPTSender
         
-        assert small_prompt < threshold
-        assert medium_prompt < threshold
-        assert large_prompt > threshold
+        assert ChatGPTSender.LARGE_PROMPT_THRESHOLD == 50000
+        assert (prompt_len > ChatGPTSender.LARGE_PROMPT_THRESHOLD) is is_large
 
 
 if __name__ == "__main__":
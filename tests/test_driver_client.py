@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for driver_client.health keep-alive against a real DriverServer (no sites, no browser)
+"""
+import asyncio
+import time
+
+import pytest
+
+from rpa_llm.driver_client import health
+from rpa_llm.driver_server import DriverServer
+
+
+@pytest.fixture
+async def driver(tmp_path):
+    """DriverServer on an ephemeral port; yields (url, server) and counts accepted connections"""
+    server = DriverServer(
+        host="127.0.0.1",
+        port=0,
+        sites=[],
+        profiles_root=tmp_path / "profiles",
+        artifacts_root=tmp_path / "artifacts",
+        prewarm=False,
+    )
+    server.connections = 0
+    handle_conn = server._handle_conn
+
+    async def counting_handle_conn(reader, writer):
+        server.connections += 1
+        await handle_conn(reader, writer)
+
+    server._handle_conn = counting_handle_conn
+    await server.start()
+    port = server._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", server
+    await server.stop()
+
+
+class TestHealthKeepAlive:
+    """health() reuses one connection per thread while the driver keeps it open"""
+
+    @pytest.mark.asyncio
+    async def test_health_reuses_connection(self, driver):
+        url, server = driver
+
+        def poll():
+            return [health(url, timeout=2)["ok"] for _ in range(5)]
+
+        # One worker thread: all polls share that thread's connection
+        assert await asyncio.to_thread(poll) == [True] * 5
+        assert server.connections == 1
+
+    @pytest.mark.asyncio
+    async def test_health_reconnects_after_idle_close(self, driver):
+        url, server = driver
+        server.KEEPALIVE_IDLE_S = 0.1
+
+        def poll_twice():
+            first = health(url, timeout=2)["ok"]
+            # Let the driver drop the idle connection, then poll again on the stale socket
+            time.sleep(0.3)
+            return first, health(url, timeout=2)["ok"]
+
+        assert await asyncio.to_thread(poll_twice) == (True, True)
+        assert server.connections == 2
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for ProcessManager (real short-lived child processes)
+"""
+import subprocess
+import sys
+import time
+
+import pytest
+
+from rpa_llm.process_manager import ProcessManager, ProcessAlreadyRunning
+
+
+def _wait_exit(manager, name, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        managed = manager.get(name)
+        if managed is not None and not managed.running:
+            return managed
+        time.sleep(0.02)
+    raise AssertionError(f"{name} did not exit in {timeout}s")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ProcessManager(cwd=tmp_path, reap_interval=0.05)
+
+
+class TestProcessManager:
+    """spawn/stop/send_input lifecycle keyed by task name"""
+
+    def test_spawn_writes_log_and_records_exit(self, manager, tmp_path):
+        log_file = tmp_path / "logs" / "task.log"
+        managed = manager.spawn("task", [sys.executable, "-c", "print('hello')"], log_file)
+
+        finished = _wait_exit(manager, "task")
+
+        assert finished is managed
+        assert finished.returncode == 0
+        assert finished.ended_at >= finished.started_at
+        assert log_file.read_text().strip() == "hello"
+
+    def test_same_name_cannot_run_twice(self, manager):
+        manager.spawn("task", [sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            with pytest.raises(ProcessAlreadyRunning):
+                manager.spawn("task", [sys.executable, "-c", "pass"])
+            # A different name is independent
+            other = manager.spawn("other", [sys.executable, "-c", "pass"])
+            assert _wait_exit(manager, "other") is other
+        finally:
+            manager.stop("task")
+
+    def test_stop_terminates_process_group(self, manager):
+        managed = manager.spawn("task", [sys.executable, "-c", "import time; time.sleep(30)"])
+
+        assert manager.stop("task") == managed.pid
+        assert _wait_exit(manager, "task").returncode == -15
+        # Stopping an exited task is a no-op
+        assert manager.stop("task") is None
+        assert manager.stop("missing") is None
+
+    def test_send_input(self, manager, tmp_path):
+        log_file = tmp_path / "input.log"
+        manager.spawn(
+            "task",
+            [sys.executable, "-c", "print('got', input())"],
+            log_file,
+            stdin=subprocess.PIPE,
+        )
+
+        assert manager.send_input("task", b"enter\n") is True
+        assert _wait_exit(manager, "task").returncode == 0
+        assert log_file.read_text().strip() == "got enter"
+        assert manager.send_input("task", b"\n") is False
+
+    def test_stats_reuses_psutil_handle(self, manager):
+        managed = manager.spawn("task", [sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            ps = managed.ps
+            stats = manager.stats("task")
+
+            assert stats["pid"] == managed.pid
+            assert stats["rss"] > 0
+            assert stats["cpu"] >= 0.0
+            assert manager.stats("task") is not None
+            assert managed.ps is ps
+        finally:
+            manager.stop("task")
+        _wait_exit(manager, "task")
+        assert manager.stats("task") is None
+        assert manager.stats("missing") is None
+
+    def test_reaper_records_exit_without_queries(self, manager):
+        managed = manager.spawn("task", [sys.executable, "-c", "pass"])
+
+        deadline = time.monotonic() + 5
+        while managed.returncode is None and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert managed.returncode == 0
@@ -105,6 +105,42 @@ class TestPrompts:
         
         # Should handle special characters
         assert "中文" in prompt
+    
+    def test_arbitration_prompt_large_scale(self):
+        """Test building prompt from 100 results across many streams"""
+        brief = Brief(
+            topic="Test Topic",
+            context="Test Context",
+            questions=[],
+            streams=[],
+            sites=["chatgpt", "gemini"],
+            output={},
+        )
+        
+        results = [
+            ModelResult(
+                run_id="test_run",
+                site_id=("chatgpt", "gemini")[i % 2],
+                stream_id=f"stream{i // 2 % 10}",
+                stream_name=f"Stream {i // 2 % 10}",
+                topic="Test Topic",
+                prompt="Test prompt",
+                answer_text=f"answer {i} " + "x" * 200,
+                source_url="",
+                created_utc="2025-01-03T12:00:00Z",
+                ok=True,
+            )
+            for i in range(100)
+        ]
+        
+        prompt = build_dual_model_arbitration_prompt(brief, results)
+        
+        # Streams are capped per side (max_streams=6) and sorted: stream0..stream5 only
+        assert prompt.count("### Stream: `") == 12
+        assert "### Stream: `stream5`" in prompt
+        assert "### Stream: `stream6`" not in prompt
+        # Answers within a stream keep their original order
+        assert prompt.index("answer 0 ") < prompt.index("answer 20 ")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for TemplateManager content merging and caching
+"""
+import json
+
+import pytest
+
+from rpa_llm.template_manager import PromptTemplate, TemplateManager
+
+
+@pytest.fixture
+def tm(tmp_path):
+    manager = TemplateManager(data_dir=tmp_path)
+    manager.create_template(PromptTemplate(id="base", name="Base", description="", content="BASE"))
+    manager.create_template(PromptTemplate(id="ext", name="Ext", description="", content="EXT", base_template_id="base"))
+    manager.create_template(PromptTemplate(id="ext2", name="Ext2", description="", content="EXT2", base_template_id="ext"))
+    return manager
+
+
+class TestTemplateContent:
+    """get_template_content merges the base chain and caches by templates.json version"""
+
+    def test_merges_base_chain(self, tm):
+        assert tm.get_template_content("base") == "BASE"
+        assert tm.get_template_content("ext2") == "BASE\n\nEXT\n\nEXT2"
+
+    def test_missing_template(self, tm):
+        with pytest.raises(ValueError, match="模板不存在"):
+            tm.get_template_content("missing")
+
+    def test_repeat_calls_skip_reload(self, tm, monkeypatch):
+        assert tm.get_template_content("ext") == "BASE\n\nEXT"
+
+        def fail():
+            raise AssertionError("templates.json reloaded")
+
+        monkeypatch.setattr(tm, "_load_templates", fail)
+        assert tm.get_template_content("ext") == "BASE\n\nEXT"
+
+    def test_update_invalidates_cache(self, tm):
+        assert tm.get_template_content("ext2") == "BASE\n\nEXT\n\nEXT2"
+
+        tm.update_template("base", {"content": "NEW BASE"})
+
+        assert tm.get_template_content("ext2") == "NEW BASE\n\nEXT\n\nEXT2"
+
+    def test_template_dicts_cached_per_llm_type(self, tm):
+        tm.create_template(PromptTemplate(id="gem", name="Gem", description="", content="G", llm_type="gemini"))
+
+        all_dicts = tm.list_template_dicts()
+        assert [d["id"] for d in all_dicts] == ["base", "ext", "ext2", "gem"]
+        assert tm.list_template_dicts() is all_dicts
+        assert [d["id"] for d in tm.list_template_dicts("chatgpt")] == ["base", "ext", "ext2"]
+
+        tm.delete_template("gem")
+
+        assert [d["id"] for d in tm.list_template_dicts()] == ["base", "ext", "ext2"]
+
+    def test_external_edit_invalidates_cache(self, tm):
+        assert tm.get_template_content("base") == "BASE"
+
+        data = json.loads(tm.templates_file.read_text(encoding="utf-8"))
+        data[0]["content"] = "EDITED BY HAND"
+        tm.templates_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        assert tm.get_template_content("base") == "EDITED BY HAND"
@@ -2,8 +2,16 @@
 """
 Unit tests for utility functions
 """
+import asyncio
+import contextlib
+import os
+import signal
+import subprocess
+import sys
+import time
+
 import pytest
-from rpa_llm.utils import slugify, beijing_now_iso
+from rpa_llm.utils import ainput, slugify, beijing_now_iso
 
 
 class TestUtils:
@@ -43,6 +51,73 @@ class TestUtils:
         assert len(result) >= 19  # At least YYYY-MM-DDTHH:MM:SS
 
 
+@pytest.fixture
+def stdin_pipe(monkeypatch):
+    """Replace sys.stdin with the read end of a pipe; yields the write fd"""
+    read_fd, write_fd = os.pipe()
+    stdin = open(read_fd, "r", encoding="utf-8")
+    monkeypatch.setattr(sys, "stdin", stdin)
+    yield write_fd
+    # close the write end first: a reader thread still blocked on the pipe sees EOF
+    with contextlib.suppress(OSError):  # some tests close it themselves
+        os.close(write_fd)
+    stdin.close()
+
+
+class TestAinput:
+    """ainput reads one line per call and its wait can be cancelled"""
+
+    async def test_reads_one_line_per_call(self, stdin_pipe):
+        os.write(stdin_pipe, "héllo\r\nnext\n".encode("utf-8"))
+
+        assert await ainput() == "héllo"
+        assert await ainput() == "next"
+
+    async def test_eof_raises(self, stdin_pipe):
+        os.close(stdin_pipe)
+
+        with pytest.raises(EOFError):
+            await ainput()
+
+    async def test_wait_is_cancellable(self, stdin_pipe):
+        task = asyncio.create_task(ainput())
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=1)
+
+    def test_ctrl_c_exits_without_enter(self):
+        """SIGINT while waiting: asyncio.run returns promptly instead of waiting for Enter"""
+        script = (
+            "import asyncio\n"
+            "from rpa_llm.utils import ainput\n"
+            "async def main():\n"
+            "    try:\n"
+            "        await ainput('ready\\n')\n"
+            "    except asyncio.CancelledError:\n"
+            "        print('interrupted', flush=True)\n"
+            "asyncio.run(main())\n"
+        )
+        proc = subprocess.Popen(
+            [sys.executable, "-c", script],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        try:
+            assert proc.stdout.readline() == b"ready\n"
+            time.sleep(0.1)
+            proc.send_signal(signal.SIGINT)
+            # stdin stays open: the old to_thread(input) version hung here until Enter
+            assert proc.wait(timeout=5) == 0
+            assert proc.stdout.read() == b"interrupted\n"
+        finally:
+            proc.kill()
+            proc.stdin.close()
+            proc.stdout.close()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
-
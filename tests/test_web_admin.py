@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for web_admin log endpoints (Flask test client against a temporary logs directory)
+"""
+import pytest
+
+import web_admin
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """logs/ holds driver_test.log; secret.txt sits next to logs/ and must not be reachable"""
+    logs_dir = tmp_path / "logs"
+    logs_dir.mkdir()
+    (logs_dir / "driver_test.log").write_text("line1\nline2\n", encoding="utf-8")
+    (tmp_path / "secret.txt").write_text("secret\n", encoding="utf-8")
+    monkeypatch.setattr(web_admin, "LOGS_DIR", logs_dir)
+    return web_admin.app.test_client()
+
+
+TRAVERSAL_NAMES = ["../secret.txt", "..%2Fsecret.txt", "..%2F..%2F..%2Fetc%2Fhostname"]
+
+
+class TestLogFileContainment:
+    """Log endpoints only serve files inside LOGS_DIR"""
+
+    def test_raw_serves_log(self, client):
+        response = client.get("/api/logs/raw/driver_test.log")
+
+        assert response.status_code == 200
+        assert response.data == b"line1\nline2\n"
+
+    @pytest.mark.parametrize("name", TRAVERSAL_NAMES)
+    def test_raw_rejects_traversal(self, client, name):
+        assert client.get(f"/api/logs/raw/{name}").status_code == 404
+
+    def test_download_serves_attachment(self, client):
+        response = client.get("/api/logs/download/driver_test.log")
+
+        assert response.status_code == 200
+        assert response.headers["Content-Disposition"].startswith("attachment")
+
+    @pytest.mark.parametrize("name", TRAVERSAL_NAMES)
+    def test_download_rejects_traversal(self, client, name):
+        assert client.get(f"/api/logs/download/{name}").status_code == 404
+
+    def test_stream_and_view_serve_log(self, client):
+        assert client.get("/api/logs/stream/driver_test.log").data == b"line1\nline2\n"
+        assert client.get("/api/logs/view/driver_test.log").get_json()["content"] == "line1\nline2\n"
+
+    @pytest.mark.parametrize("name", TRAVERSAL_NAMES)
+    def test_stream_and_view_reject_traversal(self, client, name):
+        assert client.get(f"/api/logs/stream/{name}").status_code == 404
+        assert client.get(f"/api/logs/view/{name}").status_code == 404
+
+
+
+class TestTail:
+    """_tail returns the last n \\n-terminated lines, whatever the block size"""
+
+    @pytest.mark.parametrize("data,n,expected", [
+        (b"", 2, b""),
+        (b"one\ntwo\nthree\n", 2, b"two\nthree\n"),
+        (b"one\ntwo\nthree\n", 5, b"one\ntwo\nthree\n"),
+        (b"one\ntwo\nno newline", 1, b"no newline"),
+        (b"one\ntwo\nno newline", 0, b""),
+        # \r / \x0b / \x1c are not line breaks here
+        (b"a\nprogress 10%\rprogress 100%\nnext\n", 2, b"progress 10%\rprogress 100%\nnext\n"),
+        (b"a\ncrlf\r\nsep\x0bsep\x1c\nlast\n", 3, b"crlf\r\nsep\x0bsep\x1c\nlast\n"),
+    ])
+    @pytest.mark.parametrize("block", [1, 3, 65536])
+    def test_last_lines(self, tmp_path, data, n, expected, block):
+        path = tmp_path / "x.log"
+        path.write_bytes(data)
+
+        assert web_admin._tail(path, n, block) == (expected.decode("utf-8"), len(data))
+
+
+class TestCountLines:
+    """_count_lines counts \\n bytes, cached by mtime/size in a bounded LRU"""
+
+    def test_view_reports_total_lines(self, client):
+        response = client.get("/api/logs/view/driver_test.log?count=true")
+
+        assert response.get_json()["total_lines"] == 2
+
+    def test_recount_after_append(self, tmp_path):
+        path = tmp_path / "x.log"
+        path.write_bytes(b"a\nb\n")
+        assert web_admin._count_lines(path, block=1) == 2
+
+        with open(path, "ab") as f:
+            f.write(b"c\n")
+
+        assert web_admin._count_lines(path, block=1) == 3
+
+    def test_cache_is_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(web_admin, "_line_count_cache", web_admin.OrderedDict())
+        monkeypatch.setattr(web_admin, "_LINE_COUNT_CACHE_SIZE", 2)
+        paths = [tmp_path / f"{i}.log" for i in range(3)]
+        for path in paths:
+            path.write_bytes(b"line\n")
+            web_admin._count_lines(path)
+
+        assert list(web_admin._line_count_cache) == paths[1:]
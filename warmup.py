@@ -15,10 +15,14 @@ Modified: 2025-12-30 18:37:59 +0800
 """
 
 import asyncio
+import contextlib
 import sys
 from pathlib import Path
+from typing import Optional
 
-from playwright.async_api import async_playwright
+from playwright.async_api import Playwright, async_playwright
+
+from rpa_llm.utils import ainput
 
 # 尝试导入 stealth (支持 2.0.0+ 版本)
 try:
@@ -28,6 +32,17 @@ except ImportError:
     stealth_helper = None
     print("⚠️  playwright-stealth 未安装，建议运行: pip install playwright-stealth")
 
+# 减少 webdriver 信号
+_WEBDRIVER_SCRIPT = "Object.defineProperty(navigator, 'webdriver', { get: () => undefined });"
+
+# stealth 脚本（apply_stealth_async 内部注入的就是它）只生成一次，和 webdriver 脚本合并，
+# 每个 context 一次 add_init_script 即可；取不到时退回逐页 apply_stealth_async
+try:
+    _STEALTH_SCRIPT = stealth_helper.script_payload if stealth_helper else ""
+except Exception:
+    _STEALTH_SCRIPT = ""
+_INIT_SCRIPT = f"{_STEALTH_SCRIPT}\n{_WEBDRIVER_SCRIPT}" if _STEALTH_SCRIPT else _WEBDRIVER_SCRIPT
+
 
 SITES = {
     "chatgpt": {
@@ -76,13 +91,28 @@ SITES = {
 }
 
 
-async def warmup_site(site_id: str, profiles_root: Path = Path("profiles")):
-    """预热单个站点"""
+async def warmup_site(
+    site_id: str,
+    profiles_root: Path = Path("profiles"),
+    p: Optional[Playwright] = None,
+    input_lock: Optional[asyncio.Lock] = None,
+):
+    """
+    预热单个站点
+    
+    Args:
+        p: 已启动的 Playwright（预热多个站点时共用一个 driver）；为 None 时自行启动
+        input_lock: 多个站点并发预热时串行化终端提示，保证每次回车对应一个明确的站点
+    """
     if site_id not in SITES:
         print(f"❌ 未知站点: {site_id}")
         print(f"可用站点: {', '.join(SITES.keys())}")
         return False
 
+    if p is None:
+        async with async_playwright() as p:
+            return await warmup_site(site_id, profiles_root, p, input_lock)
+
     config = SITES[site_id]
     user_data_dir = profiles_root / config["profile"]
     url = config["url"]
@@ -93,89 +123,93 @@ async def warmup_site(site_id: str, profiles_root: Path = Path("profiles")):
     print(f"🌐 URL: {url}")
     print(f"{'='*60}\n")
 
-    async with async_playwright() as p:
-        chrome_path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
-
-        # 使用与 RPA 相同的参数启动
-        context = await p.chromium.launch_persistent_context(
-            user_data_dir=str(user_data_dir),
-            executable_path=chrome_path,
-            headless=False,
-            viewport={"width": 1440, "height": 900},
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-dev-shm-usage",
-                "--disable-features=IsolateOrigins,site-per-process",
-                "--disable-infobars",
-                # 性能优化参数
-                "--disable-background-networking",
-                "--disable-background-timer-throttling",
-                "--disable-renderer-backgrounding",
-                "--disable-backgrounding-occluded-windows",
-                "--disable-ipc-flooding-protection",
-                "--disable-hang-monitor",
-                "--disable-prompt-on-repost",
-                "--disable-sync",
-                "--disable-translate",
-                "--metrics-recording-only",
-                "--safebrowsing-disable-auto-update",
-                "--enable-automation",
-                "--password-store=basic",
-                "--use-mock-keychain",
-            ],
-        )
-
-        # 默认超时设置
-        context.set_default_timeout(30_000)
-        context.set_default_navigation_timeout(45_000)
-
-        # 减少 webdriver 信号
-        await context.add_init_script(
-            """
-Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-"""
-        )
-
-        pages = context.pages
-        page = pages[0] if pages else await context.new_page()
-
-        # 注入 Stealth 脚本（如果可用）
-        if stealth_helper:
-            try:
-                await stealth_helper.apply_stealth_async(page)
-                print("✅ Stealth 模式已启用 (v2.0.0+)\n")
-            except Exception as e:
-                print(f"⚠️  Stealth 模式启用失败: {e}\n")
-        else:
-            print("⚠️  Stealth 模式不可用（建议安装: pip install playwright-stealth）\n")
-
-        # 打开目标页面
-        print(f"🌐 正在打开: {url}")
-        await page.goto(url, wait_until="domcontentloaded")
-
-        print("\n" + "=" * 60)
-        print("📋 请按照以下步骤操作：")
-        for instruction in config["instructions"]:
-            print(f"   {instruction}")
-        print("=" * 60)
-        print("\n💡 提示：")
-        print("   - 浏览器窗口已打开，请手动完成登录和验证")
-        print("   - 完成后，回到终端按回车键保存状态并关闭浏览器")
-        print("   - 保存的状态（Cookies）将被用于后续的 RPA 运行\n")
-
-        input("✅ 完成后，请按回车键继续...")
-
-        # 保存当前 URL 作为验证
-        final_url = page.url
-        print(f"\n📌 最终 URL: {final_url}")
-
-        # 关闭浏览器（状态会自动保存到 user_data_dir）
+    chrome_path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+
+    # 使用与 RPA 相同的参数启动
+    context = await p.chromium.launch_persistent_context(
+        user_data_dir=str(user_data_dir),
+        executable_path=chrome_path,
+        headless=False,
+        viewport={"width": 1440, "height": 900},
+        args=[
+            "--disable-blink-features=AutomationControlled",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--disable-dev-shm-usage",
+            "--disable-features=IsolateOrigins,site-per-process",
+            "--disable-infobars",
+            # 性能优化参数
+            "--disable-background-networking",
+            "--disable-background-timer-throttling",
+            "--disable-renderer-backgrounding",
+            "--disable-backgrounding-occluded-windows",
+            "--disable-ipc-flooding-protection",
+            "--disable-hang-monitor",
+            "--disable-prompt-on-repost",
+            "--disable-sync",
+            "--disable-translate",
+            "--metrics-recording-only",
+            "--safebrowsing-disable-auto-update",
+            "--enable-automation",
+            "--password-store=basic",
+            "--use-mock-keychain",
+        ],
+    )
+
+    # 默认超时设置
+    context.set_default_timeout(30_000)
+    context.set_default_navigation_timeout(45_000)
+
+    # stealth + webdriver 脚本一次注入（对 context 内所有页面生效）
+    await context.add_init_script(_INIT_SCRIPT)
+
+    pages = context.pages
+    page = pages[0] if pages else await context.new_page()
+
+    # 注入 Stealth 脚本（如果可用）
+    if _STEALTH_SCRIPT:
+        print("✅ Stealth 模式已启用 (v2.0.0+)\n")
+    elif stealth_helper:
+        try:
+            await stealth_helper.apply_stealth_async(page)
+            print("✅ Stealth 模式已启用 (v2.0.0+)\n")
+        except Exception as e:
+            print(f"⚠️  Stealth 模式启用失败: {e}\n")
+    else:
+        print("⚠️  Stealth 模式不可用（建议安装: pip install playwright-stealth）\n")
+
+    # 打开目标页面
+    print(f"🌐 正在打开: {url}")
+    await page.goto(url, wait_until="domcontentloaded")
+
+    # 并发预热时浏览器可以同时登录，但终端提示逐个站点出现，避免回车对应错站点
+    try:
+        async with (input_lock or contextlib.nullcontext()):
+            print("\n" + "=" * 60)
+            print(f"📋 [{site_id.upper()}] 请按照以下步骤操作：")
+            for instruction in config["instructions"]:
+                print(f"   {instruction}")
+            print("=" * 60)
+            print("\n💡 提示：")
+            print("   - 浏览器窗口已打开，请手动完成登录和验证")
+            print("   - 完成后，回到终端按回车键保存状态并关闭浏览器")
+            print("   - 保存的状态（Cookies）将被用于后续的 RPA 运行\n")
+
+            await ainput(f"✅ {site_id.upper()} 完成后，请按回车键继续...")
+    except asyncio.CancelledError:
+        # Ctrl-C：asyncio.run 取消主任务，这里关闭浏览器后继续向上取消
         await context.close()
+        raise
+
+    # 保存当前 URL 作为验证
+    final_url = page.url
+    print(f"\n📌 最终 URL: {final_url}")
+
+    # 关闭浏览器（状态会自动保存到 user_data_dir）
+    await context.close()
 
-        print(f"✅ {site_id.upper()} 预热完成！状态已保存到: {user_data_dir}\n")
-        return True
+    print(f"✅ {site_id.upper()} 预热完成！状态已保存到: {user_data_dir}\n")
+    return True
 
 
 async def main():
@@ -193,17 +227,24 @@ async def main():
     profiles_root = Path("profiles")
 
     if site_arg == "all":
-        # 预热所有站点
+        # 预热所有站点：共用一个 Playwright driver，各站点浏览器并发启动和打开页面，
+        # 终端确认通过 input_lock 逐个进行
         success_count = 0
-        for site_id in SITES.keys():
-            try:
-                if await warmup_site(site_id, profiles_root):
+        try:
+            async with async_playwright() as p:
+                input_lock = asyncio.Lock()
+                results = await asyncio.gather(
+                    *(warmup_site(site_id, profiles_root, p, input_lock) for site_id in SITES),
+                    return_exceptions=True,
+                )
+            for site_id, result in zip(SITES, results):
+                if isinstance(result, BaseException):
+                    print(f"\n❌ {site_id} 预热失败: {result}\n")
+                elif result:
                     success_count += 1
-            except KeyboardInterrupt:
-                print("\n\n⚠️  用户中断")
-                break
-            except Exception as e:
-                print(f"\n❌ {site_id} 预热失败: {e}\n")
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # asyncio.run 收到 Ctrl-C 时取消主任务，等待中的协程收到的是 CancelledError
+            print("\n\n⚠️  用户中断")
 
         print(f"\n{'='*60}")
         print(f"📊 预热完成: {success_count}/{len(SITES)} 个站点成功")
@@ -212,7 +253,7 @@ async def main():
         # 预热单个站点
         try:
             await warmup_site(site_arg, profiles_root)
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             print("\n\n⚠️  用户中断")
         except Exception as e:
             print(f"\n❌ 预热失败: {e}")
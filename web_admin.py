@@ -11,19 +11,27 @@ Browser LLM Orchestrator Web 管理界面
 - 配置管理
 """
 
-from flask import Flask, render_template, jsonify, request, send_file
+from flask import Flask, render_template, jsonify, request, send_file, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.security import safe_join
 import subprocess
 import psutil
 import os
 import sys
 import json
+import codecs
+import hashlib
 import yaml
 from pathlib import Path
 from datetime import datetime, timedelta
 import asyncio
-from typing import Optional, Dict, Any
+import concurrent.futures
+from typing import Optional, Dict, Any, Callable, Iterator, List, Tuple
 import signal
+import threading
+import time
+from collections import OrderedDict
 
 # 添加项目根目录到 sys.path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -32,57 +40,423 @@ from rpa_llm.driver_client import health
 from rpa_llm.utils import beijing_now_iso
 from rpa_llm.daily_recap import DailyRecapManager
 from rpa_llm.template_manager import get_template_manager, PromptTemplate, TalkerTemplateMapping
+from rpa_llm.process_manager import ProcessManager, ProcessAlreadyRunning
 
-app = Flask(__name__)
-CORS(app)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """用 orjson 序列化 jsonify 的响应：C 实现、直接输出 UTF-8 bytes，中文不做 \\u 转义"""
 
-# 全局状态
-driver_process: Optional[subprocess.Popen] = None
-chatlog_process: Optional[subprocess.Popen] = None
+    def _options(self, indent: bool) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self._options(bool(kwargs.get("indent")))).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._options(indent)) + b"\n",
+            mimetype=self.mimetype
+        )
+
+
+app = Flask(__name__)
+# 管理界面与 API 同源，不需要 CORS；只对两类跨域调用开放：
+# 公开复盘接口（小程序等外部应用，任意来源）和本机其他端口上的页面（如 test_web_ui.html）
+CORS(app, resources={
+    r"/api/recap/public/*": {"origins": "*"},
+    r"/api/*": {"origins": r"^https?://(127\.0\.0\.1|localhost)(:\d+)?$"},
+})
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+else:
+    # 没装 orjson：至少跳过中文的 \\u 转义和每次响应的键排序
+    app.json.ensure_ascii = False
+    app.json.sort_keys = False
+
+# 响应压缩（日志文本、JSON、页面）：用最低压缩级别，CPU 开销很小；1KB 以下的响应不压缩
+if Compress is not None:
+    app.config.update(
+        COMPRESS_MIMETYPES=['application/json', 'text/plain', 'text/html'],
+        COMPRESS_LEVEL=1,
+        COMPRESS_BR_LEVEL=1,
+        COMPRESS_ZSTD_LEVEL=1,
+        COMPRESS_MIN_SIZE=1024,
+    )
+    Compress(app)
 
 # 配置
 BASE_DIR = Path(__file__).parent
 BRIEF_PATH = BASE_DIR / "brief.yaml"
 CHATLOG_CONFIG_PATH = BASE_DIR / "chatlog_automation.yaml"
 LOGS_DIR = BASE_DIR / "logs"
+DRIVER_PID_FILE = LOGS_DIR / "driver.pid"
 DRIVER_URL = "http://127.0.0.1:27125"
+LOG_TS_FORMAT = "%Y%m%d_%H%M%S"  # 子进程日志文件名中的时间戳
+LOG_VIEW_MAX_LINES = 200      # JSON 接口最多返回的行数（整段内容要经过 jsonify 编码）
+LOG_STREAM_MAX_LINES = 10000  # 流式接口最多返回的行数
+DRIVER_STATUS_TTL_S = 0.5      # driver 状态缓存时间，期间的轮询不再请求 /health
+RECAP_TALKERS_TIMEOUT_S = 120  # 获取群聊列表的最长等待时间（chatlog 请求本身超时 60 秒）
+
+# Web 界面启动的子进程：driver、chatlog、warmup:<site>
+process_manager = ProcessManager(cwd=BASE_DIR)
+
+
+def _start_async_loop() -> asyncio.AbstractEventLoop:
+    """启动后台常驻事件循环（守护线程），复盘相关的协程都提交到这里运行"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="async-loop", daemon=True).start()
+    return loop
+
+
+# 不再每个请求新建/关闭一个事件循环
+app.config['ASYNC_LOOP'] = _start_async_loop()
+
+
+def submit_async(coro) -> "concurrent.futures.Future":
+    """把协程提交到后台事件循环，立即返回 concurrent.futures.Future"""
+    return asyncio.run_coroutine_threadsafe(coro, app.config['ASYNC_LOOP'])
+
+
+def run_async(coro, timeout: Optional[float] = None) -> Any:
+    """在后台事件循环中运行协程并等待结果；超时则取消协程并抛出 TimeoutError"""
+    future = submit_async(coro)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+# 有 libyaml 时用 C 实现的 SafeLoader，解析快数倍；没有则退回纯 Python 版本
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# YAML 配置缓存：path -> ((mtime_ns, size), 解析结果)；文件没变就不再重新解析
+# 按 LRU 最多保留 _YAML_CACHE_SIZE 个文件
+_YAML_CACHE_SIZE = 16
+_yaml_cache: "OrderedDict[Path, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+# Flask 多线程处理请求，OrderedDict 的 move_to_end/popitem 需要加锁
+_yaml_cache_lock = threading.Lock()
+
+
+def _load_yaml(path: Path) -> Any:
+    """按 mtime/size 缓存的 YAML 加载；文件不存在返回 {}（调用方只读，不要修改返回值）"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        with _yaml_cache_lock:
+            _yaml_cache.pop(path, None)
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(path)
+        if cached and cached[0] == key:
+            _yaml_cache.move_to_end(path)
+            return cached[1]
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YAML_LOADER)
+    with _yaml_cache_lock:
+        _yaml_cache[path] = (key, data)
+        _yaml_cache.move_to_end(path)
+        while len(_yaml_cache) > _YAML_CACHE_SIZE:
+            _yaml_cache.popitem(last=False)
+    return data
 
 
 def load_brief() -> Dict[str, Any]:
     """加载 brief.yaml 配置"""
-    if BRIEF_PATH.exists():
-        with open(BRIEF_PATH, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    return {}
+    return _load_yaml(BRIEF_PATH)
 
 
 def load_chatlog_config() -> Dict[str, Any]:
     """加载 chatlog_automation.yaml 配置"""
-    if CHATLOG_CONFIG_PATH.exists():
-        with open(CHATLOG_CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    return {}
+    return _load_yaml(CHATLOG_CONFIG_PATH)
 
 
-def get_driver_status() -> Dict[str, Any]:
-    """获取 Driver Server 状态"""
-    try:
-        health_result = health(DRIVER_URL)
-        return {
-            "running": True,
-            "ok": health_result.get("ok", False),
-            "sites": health_result.get("sites", []),
-            "url": DRIVER_URL,
-            "error": None
-        }
-    except Exception as e:
+# 日志行数缓存：path -> ((mtime_ns, size), 行数)；只有 ?count=true 时才需要全量计数
+# 和 _yaml_cache 一样按 LRU 限制大小，并加锁（请求在多个线程上处理）
+_LINE_COUNT_CACHE_SIZE = 64
+_line_count_cache: "OrderedDict[Path, Tuple[Tuple[int, int], int]]" = OrderedDict()
+_line_count_cache_lock = threading.Lock()
+
+
+def _tail_offset(f, n: int, block: int = 65536) -> Tuple[int, int]:
+    """
+    从文件末尾按块倒着扫描，找到最后 n 行的起始字节偏移
+    
+    只读到凑够 n 行为止，内存和耗时与文件总大小无关
+    
+    Returns:
+        (最后 n 行的起始偏移, 文件字节数)
+    """
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+    pos = end
+    buf = b''
+    newlines = 0
+    # 多要一个换行：第一块的开头可能是半行
+    while pos > 0 and newlines <= n:
+        size = min(block, pos)
+        pos -= size
+        f.seek(pos)
+        chunk = f.read(size)
+        newlines += chunk.count(b'\n')
+        buf = chunk + buf
+    # 只按 \n 切分，和上面的计数一致（splitlines 还会在 \r 等字符处断行）
+    lines = buf.split(b'\n')
+    if not lines[-1]:
+        lines.pop()  # 以换行结尾时最后一段是空串，不算一行
+    skip = max(len(lines) - n, 0)
+    # 被跳过的行都带一个 \n；n <= 0 时最后一行可能没有换行，封顶到文件末尾
+    return min(pos + sum(len(line) + 1 for line in lines[:skip]), end), end
+
+
+def _tail(path: Path, n: int = 1000, block: int = 65536) -> Tuple[str, int]:
+    """
+    取文件最后 n 行
+    
+    Returns:
+        (最后 n 行文本, 文件字节数)
+    """
+    with open(path, 'rb') as f:
+        start, end = _tail_offset(f, n, block)
+        f.seek(start)
+        tail = f.read(end - start)
+    return tail.decode('utf-8', errors='ignore'), end
+
+
+def _iter_tail(path: Path, n: int = 1000, block: int = 65536) -> Iterator[str]:
+    """逐块产出文件最后 n 行（流式响应用）；只读到开始时的文件末尾，之后追加的内容不管"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    with open(path, 'rb') as f:
+        start, end = _tail_offset(f, n, block)
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(block, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def _count_lines(path: Path, block: int = 1 << 20) -> int:
+    """按 mtime/size 缓存的日志行数统计：按 1MB 分块读取计数，不构造行列表"""
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    with _line_count_cache_lock:
+        cached = _line_count_cache.get(path)
+        if cached and cached[0] == key:
+            _line_count_cache.move_to_end(path)
+            return cached[1]
+    count = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(block), b''):
+            count += chunk.count(b'\n')
+    with _line_count_cache_lock:
+        _line_count_cache[path] = (key, count)
+        _line_count_cache.move_to_end(path)
+        while len(_line_count_cache) > _LINE_COUNT_CACHE_SIZE:
+            _line_count_cache.popitem(last=False)
+    return count
+
+
+def _driver_status(health_result: Optional[Dict[str, Any]] = None, error: Optional[Exception] = None) -> Dict[str, Any]:
+    """由一次 /health 的结果（或异常）组装 driver 状态"""
+    if health_result is None:
         return {
             "running": False,
             "ok": False,
             "sites": [],
             "url": DRIVER_URL,
-            "error": str(e)
+            "error": str(error)
         }
+    return {
+        "running": True,
+        "ok": health_result.get("ok", False),
+        "sites": health_result.get("sites", []),
+        "url": DRIVER_URL,
+        "error": None
+    }
+
+
+# 最近一次探测的 driver 状态：(time.monotonic(), 状态)；多个面板同时轮询时共用一次 /health
+_driver_status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+def _cache_driver_status(status: Dict[str, Any]) -> Dict[str, Any]:
+    global _driver_status_cache
+    _driver_status_cache = (time.monotonic(), status)
+    return status
+
+
+def _forget_driver_status() -> None:
+    """丢弃缓存的 driver 状态（停止 driver 后，下一次查询重新探测）"""
+    global _driver_status_cache
+    _driver_status_cache = None
+
+
+def get_driver_status(force: bool = False) -> Dict[str, Any]:
+    """
+    获取 Driver Server 状态（调用方只读，不要修改返回值）
+    
+    DRIVER_STATUS_TTL_S 内的重复调用直接返回上次的结果；
+    启动/停止 driver 后状态刚发生变化，用 force=True 重新探测
+    """
+    cached = _driver_status_cache
+    if not force and cached is not None and time.monotonic() - cached[0] < DRIVER_STATUS_TTL_S:
+        return cached[1]
+    try:
+        return _cache_driver_status(_driver_status(health(DRIVER_URL)))
+    except Exception as e:
+        return _cache_driver_status(_driver_status(error=e))
+
+
+def wait_driver_ready(proc: subprocess.Popen, timeout: float = 4.0,
+                      interval: float = 0.05, max_interval: float = 0.5) -> Dict[str, Any]:
+    """
+    启动后轮询 /health，一就绪就返回状态，不再固定 sleep
+    
+    轮询间隔从 interval 开始翻倍，最长 max_interval：启动快的 driver 几十毫秒内返回，
+    启动慢的也不会被高频探测。进程提前退出（如端口被占用、配置错误）时立即返回；
+    超时则返回最后一次的状态
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            health_result = health(DRIVER_URL, timeout=max_interval)
+            if health_result.get("ok"):
+                return _cache_driver_status(_driver_status(health_result))
+        except Exception:
+            pass
+        if proc.poll() is not None or time.monotonic() >= deadline:
+            break
+        time.sleep(interval)
+        interval = min(interval * 2, max_interval)
+    return get_driver_status(force=True)
+
+
+def _is_driver_cmdline(cmdline) -> bool:
+    return any('start_driver.py' in arg for arg in cmdline or ())
+
+
+def _stop_driver_from_pid_file() -> Optional[int]:
+    """
+    按 PID 文件停止由 Web 界面启动的 driver（连同它拉起的浏览器，整个进程组）
+    
+    Returns:
+        停止的 pid；没有 PID 文件、进程已退出或 PID 已被其他进程复用时返回 None
+    """
+    try:
+        pid = int(DRIVER_PID_FILE.read_text().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+    DRIVER_PID_FILE.unlink(missing_ok=True)
+    try:
+        if not _is_driver_cmdline(psutil.Process(pid).cmdline()):
+            return None
+        # 启动时用了 start_new_session=True，driver 是自己进程组的组长
+        os.killpg(os.getpgid(pid), signal.SIGTERM)
+    except (psutil.NoSuchProcess, psutil.AccessDenied, ProcessLookupError, PermissionError):
+        return None
+    return pid
+
+
+_PROC_DIR = Path("/proc")
+
+
+def _find_driver_pids() -> List[int]:
+    """
+    查找命令行里带 start_driver.py 的进程（不含本进程）
+
+    只认 python 进程。Linux 上直接读 /proc/<pid>/cmdline，不为每个进程构造 psutil.Process；
+    其他平台退回 psutil.process_iter，先按进程名过滤掉非 python 进程再读 cmdline
+    """
+    pids = []
+    if _PROC_DIR.is_dir():
+        for entry in os.listdir(_PROC_DIR):
+            if not entry.isdigit() or int(entry) == os.getpid():
+                continue
+            try:
+                with open(_PROC_DIR / entry / "cmdline", 'rb') as f:
+                    data = f.read()
+            except (FileNotFoundError, ProcessLookupError, PermissionError):
+                continue
+            # cmdline 以 NUL 分隔参数；和 psutil 分支一样只认 python 进程，避免误杀 `vim start_driver.py` 之类
+            args = data.split(b'\0')
+            if os.path.basename(args[0]).startswith(b'python') and b'start_driver.py' in data:
+                pids.append(int(entry))
+        return pids
+
+    for proc in psutil.process_iter(['name']):
+        try:
+            if proc.pid == os.getpid() or not (proc.info.get('name') or '').lower().startswith('python'):
+                continue
+            if _is_driver_cmdline(proc.cmdline()):
+                pids.append(proc.pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return pids
+
+
+# 日志列表索引：log_type -> (logs 目录的 mtime_ns, 按修改时间从新到旧排列的文件名)
+# 新建、删除、重命名文件都会改变目录 mtime；目录没变时不再逐个 stat 全部历史日志
+_log_index: Dict[str, Tuple[int, List[str]]] = {}
+
+
+def _log_names(log_type: str) -> List[str]:
+    """
+    <log_type>_*.log 文件名，按修改时间从新到旧排列
+    
+    只有目录有增删时才重新扫描；已有文件被追加写入不会改变目录 mtime，
+    这类文件的先后顺序以上次扫描为准（每次运行都写新的日志文件，实际不影响最新列表）
+    """
+    try:
+        dir_mtime = LOGS_DIR.stat().st_mtime_ns
+    except FileNotFoundError:
+        _log_index.pop(log_type, None)
+        return []
+    cached = _log_index.get(log_type)
+    if cached and cached[0] == dir_mtime:
+        return cached[1]
+    
+    prefix = f"{log_type}_"
+    entries = []
+    with os.scandir(LOGS_DIR) as it:
+        for entry in it:
+            if not (entry.name.startswith(prefix) and entry.name.endswith('.log')):
+                continue
+            try:
+                if entry.is_file():
+                    entries.append((entry.stat().st_mtime, entry.name))
+            except FileNotFoundError:
+                continue
+    entries.sort(reverse=True)
+    names = [name for _, name in entries]
+    _log_index[log_type] = (dir_mtime, names)
+    return names
 
 
 def get_latest_logs(log_type: str = "driver", limit: int = 50) -> list:
@@ -90,35 +464,67 @@ def get_latest_logs(log_type: str = "driver", limit: int = 50) -> list:
     # 特殊处理 web_admin 日志
     if log_type == "web_admin":
         web_admin_log = Path("/tmp/web_admin.log")
-        if web_admin_log.exists():
-            return [
-                {
-                    "name": "web_admin.log",
-                    "path": str(web_admin_log),
-                    "size": web_admin_log.stat().st_size,
-                    "modified": datetime.fromtimestamp(web_admin_log.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-                }
-            ]
-        return []
+        try:
+            st = web_admin_log.stat()
+        except FileNotFoundError:
+            return []
+        return [
+            {
+                "name": "web_admin.log",
+                "path": str(web_admin_log),
+                "size": st.st_size,
+                "modified": datetime.fromtimestamp(st.st_mtime).isoformat(sep=' ', timespec='seconds')
+            }
+        ]
     
-    # 常规日志文件
-    pattern = f"{log_type}_*.log"
-    log_files = sorted(
-        LOGS_DIR.glob(pattern),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True
-    )
+    # 常规日志文件：从索引取最新的 limit 个，再各 stat 一次拿到当前的大小和修改时间
+    latest = []
+    for name in _log_names(log_type)[:limit]:
+        path = LOGS_DIR / name
+        try:
+            latest.append((path, path.stat()))
+        except FileNotFoundError:
+            continue
+    latest.sort(key=lambda item: item[1].st_mtime, reverse=True)
     return [
         {
-            "name": f.name,
-            "path": str(f),
-            "size": f.stat().st_size,
-            "modified": datetime.fromtimestamp(f.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+            "name": path.name,
+            "path": str(path),
+            "size": st.st_size,
+            "modified": datetime.fromtimestamp(st.st_mtime).isoformat(sep=' ', timespec='seconds')
         }
-        for f in log_files[:limit]
+        for path, st in latest
     ]
 
 
+def _files_etag(*paths: Path, extra: str = "") -> str:
+    """由文件的 (mtime_ns, size) 计算 ETag，不读取文件内容；文件不存在按 (0, 0) 计"""
+    h = hashlib.blake2b(extra.encode("utf-8"), digest_size=8)
+    for path in paths:
+        try:
+            st = path.stat()
+            h.update(f"{path}:{st.st_mtime_ns}:{st.st_size};".encode("utf-8"))
+        except FileNotFoundError:
+            h.update(f"{path}:0:0;".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _conditional_response(etag: str, build: Callable[[], Any]) -> Any:
+    """
+    If-None-Match 命中时直接返回 304，不调用 build()（省掉配置解析和 JSON 编码）；
+    否则返回 build() 的结果并附上 ETag。Cache-Control: no-cache 让浏览器每次都带 ETag 来确认
+    """
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = app.make_response(build())
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 @app.route('/')
 def index():
     """主页"""
@@ -127,27 +533,42 @@ def index():
 
 @app.route('/api/status')
 def api_status():
-    """获取系统状态"""
+    """
+    获取系统状态
+    
+    带 ETag：driver 状态和 brief 配置都没变时返回 304，浏览器直接复用上次的响应体；
+    timestamp 不参与 ETag，表示状态最近一次变化的时间
+    """
     driver_status = get_driver_status()
     brief = load_brief()
-    
-    return jsonify({
+    status = {
         "driver": driver_status,
         "brief": {
             "sites": brief.get("sites", []),
             "output_dir": brief.get("output", {}).get("base_path", "runs")
-        },
-        "timestamp": beijing_now_iso()
+        }
+    }
+    etag = hashlib.md5(
+        json.dumps(status, sort_keys=True, default=str).encode("utf-8"),
+        usedforsecurity=False
+    ).hexdigest()
+    return _conditional_response(etag, lambda: jsonify({**status, "timestamp": beijing_now_iso()}))
+
+
+@app.route('/api/driver/process')
+def api_driver_process():
+    """Web 界面启动的 driver 进程资源占用（CPU/内存）；driver 不是由 Web 界面启动或已退出时为 null"""
+    return jsonify({
+        "ok": True,
+        "process": process_manager.stats("driver")
     })
 
 
 @app.route('/api/driver/start', methods=['POST'])
 def api_driver_start():
     """启动 Driver Server"""
-    global driver_process
-    
     # 检查是否已经运行
-    driver_status = get_driver_status()
+    driver_status = get_driver_status(force=True)
     if driver_status["running"] and driver_status["ok"]:
         return jsonify({
             "ok": False,
@@ -156,32 +577,29 @@ def api_driver_start():
     
     try:
         # 启动 Driver Server
-        log_file = LOGS_DIR / f"driver_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        LOGS_DIR.mkdir(exist_ok=True)
-        
-        with open(log_file, 'w') as f:
-            driver_process = subprocess.Popen(
-                [sys.executable, "-u", "start_driver.py", "--brief", str(BRIEF_PATH)],
-                stdout=f,
-                stderr=subprocess.STDOUT,
-                env={**os.environ, "PYTHONUNBUFFERED": "1"},
-                cwd=BASE_DIR,
-                start_new_session=True
-            )
-        
-        # 等待启动
-        import time
-        time.sleep(2)
+        log_file = LOGS_DIR / f"driver_{time.strftime(LOG_TS_FORMAT)}.log"
+        driver = process_manager.spawn(
+            "driver",
+            [sys.executable, "start_driver.py", "--brief", str(BRIEF_PATH)],
+            log_file
+        )
+        # PID 文件让 Web 界面重启后仍能找到并停止这个 driver
+        DRIVER_PID_FILE.write_text(str(driver.pid))
         
-        # 验证状态
-        driver_status = get_driver_status()
+        # 等待就绪并验证状态（最多 4 秒，就绪即返回）
+        driver_status = wait_driver_ready(driver.proc)
         
         return jsonify({
             "ok": True,
-            "pid": driver_process.pid,
+            "pid": driver.pid,
             "log_file": str(log_file),
             "status": driver_status
         })
+    except ProcessAlreadyRunning as e:
+        return jsonify({
+            "ok": False,
+            "error": f"Driver Server 正在启动: {e}"
+        })
     except Exception as e:
         return jsonify({
             "ok": False,
@@ -192,24 +610,25 @@ def api_driver_start():
 @app.route('/api/driver/stop', methods=['POST'])
 def api_driver_stop():
     """停止 Driver Server"""
-    global driver_process
-    
     try:
-        # 查找并停止所有 start_driver.py 进程
         stopped_pids = []
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                cmdline = proc.info.get('cmdline', [])
-                if cmdline and 'start_driver.py' in ' '.join(cmdline):
-                    proc.terminate()
-                    stopped_pids.append(proc.info['pid'])
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        
-        if driver_process and driver_process.poll() is None:
-            driver_process.terminate()
-            stopped_pids.append(driver_process.pid)
-            driver_process = None
+        pid = process_manager.stop("driver")
+        if pid is not None:
+            DRIVER_PID_FILE.unlink(missing_ok=True)
+        else:
+            # Web 界面重启过：按 PID 文件停止之前启动的 driver
+            pid = _stop_driver_from_pid_file()
+        if pid is not None:
+            stopped_pids.append(pid)
+        else:
+            # 没有 PID 文件（如命令行手动启动的 driver）：扫描进程查找 start_driver.py
+            for pid in _find_driver_pids():
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    stopped_pids.append(pid)
+                except (ProcessLookupError, PermissionError):
+                    pass
+        _forget_driver_status()
         
         return jsonify({
             "ok": True,
@@ -224,27 +643,89 @@ def api_driver_stop():
 
 @app.route('/api/warmup/<site>', methods=['POST'])
 def api_warmup(site: str):
-    """预热指定站点"""
-    try:
-        result = subprocess.run(
-            [sys.executable, "warmup.py", site],
-            capture_output=True,
-            text=True,
-            cwd=BASE_DIR,
-            timeout=180
+    """
+    预热指定站点：后台启动 warmup.py 后立即返回，输出写入 logs/warmup_<site>_<时间>.log
+    
+    预热需要人工登录，耗时不定；登录完成后调用 /api/warmup/<site>/finish 代替终端里的回车
+    """
+    try:
+        log_file = LOGS_DIR / f"warmup_{site}_{time.strftime(LOG_TS_FORMAT)}.log"
+        warmup = process_manager.spawn(
+            f"warmup:{site}",
+            [sys.executable, "-u", "warmup.py", site],
+            log_file,
+            stdin=subprocess.PIPE
         )
         
         return jsonify({
-            "ok": result.returncode == 0,
+            "ok": True,
             "site": site,
-            "stdout": result.stdout,
-            "stderr": result.stderr
+            "pid": warmup.pid,
+            "log_file": str(log_file),
+            "message": "预热已启动，请在打开的浏览器窗口中手动登录"
         })
-    except subprocess.TimeoutExpired:
+    except ProcessAlreadyRunning as e:
+        return jsonify({
+            "ok": False,
+            "error": f"{site} 正在预热中: {e}"
+        }), 409
+    except Exception as e:
         return jsonify({
             "ok": False,
-            "error": "预热超时（3分钟）"
+            "error": str(e)
         }), 500
+
+
+@app.route('/api/warmup/<site>/status')
+def api_warmup_status(site: str):
+    """查询预热进程状态"""
+    warmup = process_manager.get(f"warmup:{site}")
+    if warmup is None:
+        return jsonify({"ok": True, "site": site, "running": False, "returncode": None})
+    return jsonify({
+        "ok": True,
+        "site": site,
+        "running": warmup.running,
+        "pid": warmup.pid,
+        "returncode": warmup.returncode,
+        "process": process_manager.stats(f"warmup:{site}")
+    })
+
+
+@app.route('/api/warmup/<site>/finish', methods=['POST'])
+def api_warmup_finish(site: str):
+    """登录完成：向 warmup.py 发送回车，让它保存状态并关闭浏览器"""
+    try:
+        if not process_manager.send_input(f"warmup:{site}", b"\n"):
+            return jsonify({
+                "ok": False,
+                "error": f"{site} 没有正在进行的预热"
+            }), 404
+        return jsonify({
+            "ok": True,
+            "message": f"已通知 {site} 保存状态"
+        })
+    except Exception as e:
+        return jsonify({
+            "ok": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/warmup/<site>/stop', methods=['POST'])
+def api_warmup_stop(site: str):
+    """终止预热（连同它打开的浏览器，整个进程组）；不会保存当前页面状态"""
+    try:
+        pid = process_manager.stop(f"warmup:{site}")
+        if pid is None:
+            return jsonify({
+                "ok": False,
+                "error": f"{site} 没有正在进行的预热"
+            }), 404
+        return jsonify({
+            "ok": True,
+            "message": f"{site} 预热已终止 (PID: {pid})"
+        })
     except Exception as e:
         return jsonify({
             "ok": False,
@@ -255,8 +736,6 @@ def api_warmup(site: str):
 @app.route('/api/chatlog/run', methods=['POST'])
 def api_chatlog_run():
     """运行 Chatlog 自动化"""
-    global chatlog_process
-    
     data = request.json
     talker = data.get('talker')
     start_date = data.get('start')
@@ -289,22 +768,20 @@ def api_chatlog_run():
             cmd.append("--new-chat")
         
         # 启动进程
-        log_file = LOGS_DIR / f"chatlog_web_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        with open(log_file, 'w') as f:
-            chatlog_process = subprocess.Popen(
-                cmd,
-                stdout=f,
-                stderr=subprocess.STDOUT,
-                cwd=BASE_DIR,
-                start_new_session=True
-            )
+        log_file = LOGS_DIR / f"chatlog_web_{time.strftime(LOG_TS_FORMAT)}.log"
+        chatlog = process_manager.spawn("chatlog", cmd, log_file)
         
         return jsonify({
             "ok": True,
-            "pid": chatlog_process.pid,
+            "pid": chatlog.pid,
             "log_file": str(log_file),
             "message": "Chatlog 自动化已启动，请查看日志"
         })
+    except ProcessAlreadyRunning as e:
+        return jsonify({
+            "ok": False,
+            "error": f"Chatlog 自动化正在运行: {e}"
+        }), 409
     except Exception as e:
         return jsonify({
             "ok": False,
@@ -312,6 +789,21 @@ def api_chatlog_run():
         }), 500
 
 
+@app.route('/api/chatlog/status')
+def api_chatlog_status():
+    """查询 Web 界面启动的 Chatlog 自动化进程状态（退出码由后台线程回收时记录）"""
+    chatlog = process_manager.get("chatlog")
+    if chatlog is None:
+        return jsonify({"ok": True, "running": False, "returncode": None})
+    return jsonify({
+        "ok": True,
+        "running": chatlog.running,
+        "pid": chatlog.pid,
+        "returncode": chatlog.returncode,
+        "log_file": str(chatlog.log_file) if chatlog.log_file else None,
+        "process": process_manager.stats("chatlog")
+    })
+
 @app.route('/api/logs/<log_type>')
 def api_logs_list(log_type: str):
     """获取日志文件列表"""
@@ -328,33 +820,54 @@ def api_logs_list(log_type: str):
         }), 500
 
 
+def _resolve_log_file(filename: str) -> Optional[Path]:
+    """
+    日志文件名 -> 路径；只允许 logs 目录内的文件（以及 /tmp/web_admin.log）
+    
+    含 ../、绝对路径等会跳出 logs 目录的文件名返回 None，调用方按文件不存在处理
+    """
+    # 特殊处理 web_admin.log
+    if filename == "web_admin.log":
+        return Path("/tmp/web_admin.log")
+    path = safe_join(str(LOGS_DIR), filename)
+    return Path(path) if path is not None else None
+
+
+def _lines_arg(name: str, default: int, maximum: int) -> int:
+    """读取行数参数并限制在 [1, maximum]"""
+    value = request.args.get(name, default, type=int)
+    return max(1, min(value, maximum))
+
+
 @app.route('/api/logs/view/<path:filename>')
 def api_logs_view(filename: str):
-    """查看日志文件内容"""
+    """查看日志文件内容（JSON，最多 LOG_VIEW_MAX_LINES 行；完整尾部请用 /api/logs/stream）"""
     try:
-        # 特殊处理 web_admin.log
-        if filename == "web_admin.log":
-            log_file = Path("/tmp/web_admin.log")
-        else:
-            log_file = LOGS_DIR / filename
+        log_file = _resolve_log_file(filename)
         
-        if not log_file.exists():
+        # 只读取最后 limit 行；总行数需要全量扫描，仅在 ?count=true 时返回
+        # 不事先 exists()：直接打开，文件不存在时由 open 报错，省一次 stat
+        limit = _lines_arg('limit', LOG_VIEW_MAX_LINES, LOG_VIEW_MAX_LINES)
+        try:
+            if log_file is None:
+                raise FileNotFoundError(filename)
+            content, size = _tail(log_file, limit)
+        except FileNotFoundError:
             return jsonify({
                 "ok": False,
                 "error": "日志文件不存在"
             }), 404
-        
-        # 读取最后 1000 行
-        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-            content = ''.join(lines[-1000:])
-        
-        return jsonify({
+        result = {
             "ok": True,
             "filename": filename,
             "content": content,
-            "total_lines": len(lines)
-        })
+            "size": size,
+            "total_lines": None
+        }
+        if request.args.get('count', '').lower() in ('1', 'true', 'yes'):
+            result["total_lines"] = _count_lines(log_file)
+        
+        return jsonify(result)
     except Exception as e:
         return jsonify({
             "ok": False,
@@ -362,15 +875,51 @@ def api_logs_view(filename: str):
         }), 500
 
 
+@app.route('/api/logs/stream/<path:filename>')
+def api_logs_stream(filename: str):
+    """以纯文本流式返回日志尾部（默认最后 1000 行，?lines= 可调），不经过 JSON 编码"""
+    log_file = _resolve_log_file(filename)
+    if log_file is None or not log_file.is_file():
+        return Response("日志文件不存在\n", status=404, mimetype='text/plain')
+    
+    lines = _lines_arg('lines', 1000, LOG_STREAM_MAX_LINES)
+    return Response(
+        stream_with_context(_iter_tail(log_file, lines)),
+        mimetype='text/plain',
+        headers={
+            "Content-Disposition": "inline",
+            "Cache-Control": "no-cache",
+        },
+    )
+
+
+@app.route('/api/logs/raw/<path:filename>', defaults={'download': False})
+@app.route('/api/logs/download/<path:filename>', defaults={'download': True})
+def api_logs_raw(filename: str, download: bool):
+    """
+    原样返回整个日志文件：/raw 在浏览器中直接查看，/download 作为附件下载
+
+    send_file(conditional=True) 带 ETag/Last-Modified 并支持 Range 请求，
+    客户端可以只取文件末尾，例如 curl -r -65536 只下载最后 64KB；
+    文件内容不经过 Python 读取，WSGI 服务器支持 wsgi.file_wrapper 时由内核 sendfile 直接发送
+    """
+    log_file = _resolve_log_file(filename)
+    if log_file is None or not log_file.is_file():
+        return Response("日志文件不存在\n", status=404, mimetype='text/plain')
+    return send_file(log_file, mimetype='text/plain', as_attachment=download, conditional=True, max_age=0)
+
+
 @app.route('/api/config/brief')
 def api_config_brief():
-    """获取 brief.yaml 配置"""
+    """获取 brief.yaml 配置（ETag 由文件 mtime/size 计算，未修改时返回 304）"""
     try:
-        brief = load_brief()
-        return jsonify({
-            "ok": True,
-            "config": brief
-        })
+        return _conditional_response(
+            _files_etag(BRIEF_PATH),
+            lambda: jsonify({
+                "ok": True,
+                "config": load_brief()
+            })
+        )
     except Exception as e:
         return jsonify({
             "ok": False,
@@ -380,13 +929,15 @@ def api_config_brief():
 
 @app.route('/api/config/chatlog')
 def api_config_chatlog():
-    """获取 chatlog_automation.yaml 配置"""
+    """获取 chatlog_automation.yaml 配置（ETag 由文件 mtime/size 计算，未修改时返回 304）"""
     try:
-        config = load_chatlog_config()
-        return jsonify({
-            "ok": True,
-            "config": config
-        })
+        return _conditional_response(
+            _files_etag(CHATLOG_CONFIG_PATH),
+            lambda: jsonify({
+                "ok": True,
+                "config": load_chatlog_config()
+            })
+        )
     except Exception as e:
         return jsonify({
             "ok": False,
@@ -403,13 +954,7 @@ def api_recap_talkers():
         days = int(request.args.get('days', 7))
         manager = DailyRecapManager()
         
-        # 在新的事件循环中运行异步函数
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            talkers = loop.run_until_complete(manager.get_available_talkers(days=days))
-        finally:
-            loop.close()
+        talkers = run_async(manager.get_available_talkers(days=days), timeout=RECAP_TALKERS_TIMEOUT_S)
         
         return jsonify({
             "ok": True,
@@ -524,6 +1069,11 @@ def api_recap_batch(batch_id):
         }), 500
 
 
+def _report_recap_failure(future: "concurrent.futures.Future") -> None:
+    if not future.cancelled() and future.exception() is not None:
+        print(f"复盘批次处理失败: {future.exception()!r}")
+
+
 @app.route('/api/recap/process/<batch_id>', methods=['POST'])
 def api_recap_process(batch_id):
     """处理批次（启动后台任务）"""
@@ -534,25 +1084,14 @@ def api_recap_process(batch_id):
         
         manager = DailyRecapManager()
         
-        # 在后台线程中运行处理任务
-        def run_process():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                template_path = Path(template) if template else None
-                loop.run_until_complete(
-                    manager.process_batch(
-                        batch_id=batch_id,
-                        template_path=template_path,
-                        timeout=timeout
-                    )
-                )
-            finally:
-                loop.close()
-        
-        import threading
-        thread = threading.Thread(target=run_process, daemon=True)
-        thread.start()
+        # 提交到后台事件循环，不等待结果（耗时的 driver 调用在 chatlog_automation 里已放到线程中执行）
+        template_path = Path(template) if template else None
+        future = submit_async(manager.process_batch(
+            batch_id=batch_id,
+            template_path=template_path,
+            timeout=timeout
+        ))
+        future.add_done_callback(_report_recap_failure)
         
         return jsonify({
             "ok": True,
@@ -566,6 +1105,37 @@ def api_recap_process(batch_id):
         }), 500
 
 
+# 复盘总结内容缓存：path -> ((mtime_ns, size), 内容)；任务完成后文件基本不再变化，按 LRU 保留
+_SUMMARY_CACHE_SIZE = 64
+_summary_cache: "OrderedDict[str, Tuple[Tuple[int, int], str]]" = OrderedDict()
+_summary_cache_lock = threading.Lock()
+# 读取总结文件的线程池（线程按需创建）：冷缓存时多个文件的读取可以同时进行
+_summary_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="summary-io")
+
+
+def _read_summary(path: str) -> Optional[str]:
+    """读取总结文件（按 mtime/size 缓存）；读取失败返回 None"""
+    try:
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        with _summary_cache_lock:
+            cached = _summary_cache.get(path)
+            if cached and cached[0] == key:
+                _summary_cache.move_to_end(path)
+                return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        print(f"读取总结文件失败 {path}: {e}")
+        return None
+    with _summary_cache_lock:
+        _summary_cache[path] = (key, content)
+        _summary_cache.move_to_end(path)
+        while len(_summary_cache) > _SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+    return content
+
+
 @app.route('/api/recap/public/<batch_id>')
 def api_recap_public(batch_id):
     """
@@ -600,21 +1170,19 @@ def api_recap_public(batch_id):
             "summaries": []
         }
         
-        # 读取每个任务的总结内容
-        for task in batch.tasks:
-            if task.status == "completed" and task.result_path:
-                try:
-                    with open(task.result_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    result["summaries"].append({
-                        "talker": task.display_name,
-                        "date": task.date,
-                        "message_count": task.message_count,
-                        "content": content
-                    })
-                except Exception as e:
-                    print(f"读取总结文件失败 {task.result_path}: {e}")
+        # 并发读取各任务的总结内容（保持任务顺序，读取失败的跳过）
+        tasks = [task for task in batch.tasks if task.status == "completed" and task.result_path]
+        contents = _summary_pool.map(_read_summary, [task.result_path for task in tasks])
+        result["summaries"] = [
+            {
+                "talker": task.display_name,
+                "date": task.date,
+                "message_count": task.message_count,
+                "content": content
+            }
+            for task, content in zip(tasks, contents)
+            if content is not None
+        ]
         
         return jsonify(result)
     except Exception as e:
@@ -630,16 +1198,18 @@ def api_recap_public(batch_id):
 
 @app.route('/api/templates', methods=['GET'])
 def api_templates_list():
-    """获取所有模板"""
+    """获取所有模板（ETag 由 templates.json 的 mtime/size 和 llm_type 计算）"""
     try:
         tm = get_template_manager()
         llm_type = request.args.get('llm_type')
-        templates = tm.list_templates(llm_type=llm_type)
         
-        return jsonify({
-            "ok": True,
-            "templates": [t.to_dict() for t in templates]
-        })
+        return _conditional_response(
+            _files_etag(tm.templates_file, extra=llm_type or ""),
+            lambda: jsonify({
+                "ok": True,
+                "templates": tm.list_template_dicts(llm_type=llm_type)
+            })
+        )
     except Exception as e:
         return jsonify({
             "ok": False,
@@ -756,15 +1326,17 @@ def api_template_delete(template_id: str):
 
 @app.route('/api/templates/<template_id>/content', methods=['GET'])
 def api_template_get_content(template_id: str):
-    """获取模板的完整内容（包含基础模板合并）"""
+    """获取模板的完整内容（包含基础模板合并；ETag 由 templates.json 的 mtime/size 计算）"""
     try:
         tm = get_template_manager()
-        content = tm.get_template_content(template_id)
         
-        return jsonify({
-            "ok": True,
-            "content": content
-        })
+        return _conditional_response(
+            _files_etag(tm.templates_file, extra=template_id),
+            lambda: jsonify({
+                "ok": True,
+                "content": tm.get_template_content(template_id)
+            })
+        )
     except ValueError as e:
         return jsonify({
             "ok": False,
@@ -783,15 +1355,17 @@ def api_template_get_content(template_id: str):
 
 @app.route('/api/template-mappings', methods=['GET'])
 def api_mappings_list():
-    """获取所有映射"""
+    """获取所有映射（ETag 由 mappings.json 的 mtime/size 计算）"""
     try:
         tm = get_template_manager()
-        mappings = tm.list_mappings()
         
-        return jsonify({
-            "ok": True,
-            "mappings": [m.to_dict() for m in mappings]
-        })
+        return _conditional_response(
+            _files_etag(tm.mappings_file),
+            lambda: jsonify({
+                "ok": True,
+                "mappings": [m.to_dict() for m in tm.list_mappings()]
+            })
+        )
     except Exception as e:
         return jsonify({
             "ok": False,
@@ -881,12 +1455,26 @@ if __name__ == '__main__':
     print(f"🚀 启动 Web 管理界面: http://127.0.0.1:{port}")
     print(f"📁 项目目录: {BASE_DIR}")
     print(f"📝 日志目录: {LOGS_DIR}")
+    if _YAML_LOADER is yaml.SafeLoader:
+        print("⚠️  PyYAML 未带 libyaml，YAML 配置改用纯 Python 解析（较慢）；建议重新安装 PyYAML 官方 wheel: pip install --force-reinstall pyyaml")
     print()
     
-    app.run(
-        host='0.0.0.0',
-        port=port,
-        debug=True,
-        use_reloader=False  # 避免重复启动
-    )
+    # WEB_ADMIN_DEV=1：本地调试，用 Flask 开发服务器（debug 模式、单线程）
+    if os.environ.get('WEB_ADMIN_DEV') == '1':
+        app.run(
+            host='0.0.0.0',
+            port=port,
+            debug=True,
+            use_reloader=False  # 避免重复启动
+        )
+    else:
+        app.debug = False
+        try:
+            # 多线程 WSGI 服务器：状态轮询、日志查看等请求互不排队
+            from waitress import serve
+        except ImportError:
+            print("⚠️  waitress 未安装，退回 Flask 内置服务器（建议运行: pip install waitress）")
+            app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
+        else:
+            serve(app, host='0.0.0.0', port=port, threads=8)
 